@@ -1,7 +1,8 @@
 import sys
-from math import e
+from application import problem
 from application.gui.main_window import MainWindow
 from application.middleware import Midleware
+from application.parallel import can_fork
 from PyQt5 import QtWidgets
 
 
@@ -14,12 +15,15 @@ class Application:
         :return:
         """
         app = QtWidgets.QApplication([])
-        midleware = Midleware(
-            lambda x, y: (3 * y + 2 * x * y) / x ** 2,
-            lambda x: e ** (- 3 / x) * x ** 2
-        )
+        midleware = Midleware(problem.f, problem.solution)
+        # Methods are pure Python loops, which hold GIL, so they are solved simultaneously only by processes.
+        # Without fork thread pool is kept
+        if can_fork():
+            midleware.use_process_pool()
 
         main_window = MainWindow(app, midleware)
         main_window.show()
 
-        sys.exit(app.exec())
+        code = app.exec()
+        midleware.shutdown()
+        sys.exit(code)
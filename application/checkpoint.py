@@ -0,0 +1,172 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+from functools import partial
+from types import BuiltinFunctionType, CodeType, FunctionType, MethodType, ModuleType
+from typing import Dict, Optional
+from application import results_io
+
+
+def _get_code_names(code: CodeType):
+    """
+    Get names of globals and attributes, which are used by code object and nested code objects
+
+    :param code: code object
+    :return: set of names
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _get_code_names(const)
+    return names
+
+
+def _update_with_code(digest, code: CodeType):
+    """
+    Update digest with code object and nested code objects
+
+    :param digest: hashlib digest
+    :param code: code object
+    :return:
+    """
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _update_with_code(digest, const)
+        else:
+            digest.update(repr(const).encode("utf-8"))
+
+
+def _update_with_name(digest, value):
+    """
+    Update digest with module and qualified name of value
+
+    :param digest: hashlib digest
+    :param value: function, class or module
+    :return:
+    """
+    name = f"{getattr(value, '__module__', None)}.{getattr(value, '__qualname__', getattr(value, '__name__', None))}"
+    digest.update(name.encode("utf-8"))
+
+
+def _update_with_value(digest, value, seen: Optional[set] = None):
+    """
+    Update digest with value. Hash does not depend on memory addresses, so it is the same in every process.
+    Functions are hashed by code, closure, defaults and used globals, so lambdas with different
+    captured functions or functions with changed module constants have different hashes.
+    Partials are hashed by function and arguments, builtins, classes and modules by name,
+    other objects without own repr by type and attributes
+
+    :param digest: hashlib digest
+    :param value: any value
+    :param seen: ids of functions and objects, which are being hashed (recursive references are hashed by name)
+    :return:
+    """
+    seen = seen if seen is not None else set()
+    if isinstance(value, (FunctionType, partial)) or hasattr(value, "__dict__"):
+        if id(value) in seen:
+            _update_with_name(digest, value if isinstance(value, (FunctionType, type, ModuleType)) else type(value))
+            return
+        seen = seen | {id(value)}
+
+    if isinstance(value, FunctionType):
+        _update_with_code(digest, value.__code__)
+        for cell in value.__closure__ or ():
+            _update_with_value(digest, cell.cell_contents, seen)
+        _update_with_value(digest, value.__defaults__, seen)
+        for name in sorted(_get_code_names(value.__code__)):
+            if name in value.__globals__:
+                digest.update(name.encode("utf-8"))
+                _update_with_value(digest, value.__globals__[name], seen)
+    elif isinstance(value, partial):
+        _update_with_value(digest, value.func, seen)
+        _update_with_value(digest, value.args, seen)
+        _update_with_value(digest, value.keywords, seen)
+    elif isinstance(value, MethodType):
+        _update_with_name(digest, type(value.__self__))
+        _update_with_value(digest, value.__func__, seen)
+    elif isinstance(value, (ModuleType, type, BuiltinFunctionType)):
+        _update_with_name(digest, value)
+    elif isinstance(value, np.ndarray):
+        digest.update(f"{value.dtype.str}{value.shape}".encode("utf-8"))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, np.generic):
+        digest.update(repr(value.item()).encode("utf-8"))
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode("utf-8"))
+        for item in value:
+            _update_with_value(digest, item, seen)
+    elif isinstance(value, dict):
+        digest.update(f"dict{len(value)}".encode("utf-8"))
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode("utf-8"))
+            _update_with_value(digest, value[key], seen)
+    elif type(value).__repr__ is object.__repr__:
+        # Default repr contains memory address, so object is hashed by type, attributes and __call__
+        _update_with_name(digest, type(value))
+        _update_with_value(digest, type(value).__call__ if callable(value) else None, seen)
+        _update_with_value(digest, getattr(value, "__dict__", None), seen)
+    else:
+        digest.update(repr(value).encode("utf-8"))
+
+
+def problem_hash(*definition):
+    """
+    Get hash of problem definition (method, functions, interval, precision...)
+
+    :param definition: values, which define problem
+    :return: hex digest
+    """
+    digest = hashlib.sha256()
+    for value in definition:
+        _update_with_value(digest, value)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def save_checkpoint(path: str, arrays: Dict[str, np.ndarray], definition_hash: str):
+    """
+    Save checkpoint atomically: temporary file in the same directory replaces old checkpoint
+
+    :param path: path of checkpoint (.npz or .cols)
+    :param arrays: state (name -> array)
+    :param definition_hash: hash of problem definition
+    :return:
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=os.path.splitext(path)[1])
+    os.close(descriptor)
+    try:
+        results_io.save(temporary_path, arrays, {"hash": definition_hash})
+        with open(temporary_path, "rb") as file:
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+    # Make rename durable
+    if hasattr(os, "O_DIRECTORY"):
+        descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(descriptor)
+        finally:
+            os.close(descriptor)
+
+
+def load_checkpoint(path: str, definition_hash: str) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Load checkpoint
+
+    :param path: path of checkpoint (.npz or .cols)
+    :param definition_hash: hash of problem definition, must match the saved one
+    :return: state (name -> array) or None if there is no checkpoint
+    """
+    if not os.path.exists(path):
+        return None
+    arrays, meta = results_io.load(path)
+    if meta.get("hash") != definition_hash:
+        raise ValueError("Checkpoint belongs to another problem!", {"checkpoint": "checkpoint"})
+    return {name: np.array(array) for name, array in arrays.items()}
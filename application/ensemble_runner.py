@@ -0,0 +1,159 @@
+import multiprocessing
+import numpy as np
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+from application.checkpoint import load_checkpoint, save_checkpoint
+from application.methods.numerical_method import NumericalMethod
+
+
+def _run_chunks(method: NumericalMethod, shm: SharedMemory, shape: tuple, dtype: type, y0: np.ndarray,
+                pending: np.ndarray, next_chunk, done, chunk_size: int, x0: float, x: float, n: int,
+                threshold: Optional[float]):
+    """
+    Worker loop: take next chunk of initial values, solve it and write result into shared memory
+
+    :param method: numerical method (kernel)
+    :param shm: shared memory block with results (y, gte)
+    :param shape: shape of results
+    :param dtype: precision of computation
+    :param y0: all initial values
+    :param pending: indices of chunks to compute
+    :param next_chunk: shared counter of taken chunks
+    :param done: shared flags of computed initial values
+    :param chunk_size: number of initial values in chunk
+    :return:
+    """
+    results = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    while True:
+        with next_chunk.get_lock():
+            taken = next_chunk.value
+            next_chunk.value += 1
+
+        if taken >= len(pending):
+            break
+        start = pending[taken] * chunk_size
+        end = min(start + chunk_size, len(y0))
+        _, results[0, start:end], _, results[1, start:end] = method.compute_ensemble(
+            x0, y0[start:end], x, n, threshold, dtype
+        )
+        done[start:end] = [1] * (end - start)
+
+
+class EnsembleRunner:
+    # Number of chunks per worker, more chunks balance uneven workloads better
+    CHUNKS_PER_WORKER = 8
+
+    def __init__(self, method: NumericalMethod, workers: Optional[int] = None, chunk_size: Optional[int] = None):
+        """
+        Init runner, which splits ensemble of initial values between worker processes.
+        Workers are forked, so they inherit method and write results into shared memory
+
+        :param method: numerical method (kernel)
+        :param workers: number of processes (number of CPUs by default)
+        :param chunk_size: number of initial values in chunk (computed from number of workers by default)
+        """
+        self._method = method
+        self._workers = workers if workers is not None else multiprocessing.cpu_count()
+        self._chunk_size = chunk_size
+
+    def run(self, x0: float, y0: np.ndarray, x: float, n: int, threshold: Optional[float] = None,
+            dtype: type = np.float64, checkpoint: Optional[str] = None, checkpoint_interval: float = 10.0,
+            resume: bool = False):
+        """
+        Compute approximation and gte for array of initial values.
+        Workers take chunks dynamically, so early stopped trajectories do not leave workers idle.
+        Computed initial values are periodically saved to checkpoint, resumed computation skips them
+
+        :param x0: start point (x component)
+        :param y0: array of start points (y component)
+        :param x: end point (x component)
+        :param n: number of intervals
+        :param threshold: max allowed absolute value of y
+        :param dtype: precision of computation (float32, float64, longdouble)
+        :param checkpoint: path of checkpoint (.npz or .cols)
+        :param checkpoint_interval: min time between checkpoints in seconds
+        :param resume: continue computation from checkpoint
+        :return: array of x, arrays of y and gte of shape (len(y0), n + 1)
+        """
+        y0 = np.asarray(y0, dtype=dtype)
+        if len(y0) == 0:
+            raise ValueError("Ensemble must contain initial values!", {"y0": "y0"})
+
+        # Check initial values before starting workers
+        if self._method.has_solution():
+            self._method._get_family_solution(x0, y0)
+
+        chunk_size = self._chunk_size
+        if chunk_size is None:
+            chunk_size = max(1, -(-len(y0) // (self._workers * self.CHUNKS_PER_WORKER)))
+
+        shape = (2, len(y0), n + 1)
+        context = multiprocessing.get_context("fork")
+        done = context.RawArray("b", len(y0))
+        shm = SharedMemory(create=True, size=int(np.prod(shape)) * np.dtype(dtype).itemsize)
+        try:
+            results = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            done_flags = np.frombuffer(done, dtype=np.int8)
+
+            definition_hash = None
+            if checkpoint is not None:
+                definition_hash = self._method.get_definition_hash(
+                    "ensemble", float(x0), y0, float(x), n, threshold, np.dtype(dtype).str
+                )
+                state = load_checkpoint(checkpoint, definition_hash) if resume else None
+                if state is not None:
+                    results[0], results[1] = state["y"], state["gte"]
+                    done_flags[:] = state["done"]
+
+            # Chunks with at least one not computed initial value
+            chunks = -(-len(y0) // chunk_size)
+            pending = np.array([
+                chunk for chunk in range(chunks) if not np.all(done_flags[chunk * chunk_size:(chunk + 1) * chunk_size])
+            ], dtype=int)
+            workers = min(self._workers, len(pending))
+
+            next_chunk = context.Value("q", 0)
+            processes = [
+                context.Process(
+                    target=_run_chunks,
+                    args=(self._method, shm, shape, dtype, y0, pending, next_chunk, done, chunk_size, x0, x, n,
+                          threshold)
+                )
+                for _ in range(workers)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                while process.is_alive():
+                    process.join(checkpoint_interval if checkpoint is not None else None)
+                    if checkpoint is not None and process.is_alive():
+                        self.__save_checkpoint(checkpoint, results, done_flags, definition_hash)
+
+            if checkpoint is not None:
+                self.__save_checkpoint(checkpoint, results, done_flags, definition_hash)
+            if any(process.exitcode != 0 for process in processes):
+                raise RuntimeError("Ensemble worker failed!")
+
+            y_, gte = results[0].copy(), results[1].copy()
+            del results
+        finally:
+            shm.close()
+            shm.unlink()
+
+        x_, _ = self._method.get_grid(x0, x, n, dtype)
+        return x_, y_, gte
+
+    @staticmethod
+    def __save_checkpoint(checkpoint: str, results: np.ndarray, done_flags: np.ndarray, definition_hash: str):
+        """
+        Save computed initial values to checkpoint
+
+        :param checkpoint: path of checkpoint
+        :param results: shared results (y, gte)
+        :param done_flags: shared flags of computed initial values
+        :param definition_hash: hash of problem definition
+        :return:
+        """
+        # Flags are read first, so flagged rows are completely written
+        done = done_flags.astype(bool)
+        save_checkpoint(checkpoint, {"y": results[0], "gte": results[1], "done": done}, definition_hash)
@@ -1,8 +1,17 @@
-from PyQt5 import QtWidgets
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5 import QtCore, QtWidgets
 from application.middleware import Midleware
 from qui_configurator import GuiConfigurator
 
 
+class _LiveSignals(QtCore.QObject):
+    # Generation of job, type of graph, graphs
+    computed = QtCore.pyqtSignal(int, str, object)
+    # Generation of job, ValueError
+    failed = QtCore.pyqtSignal(int, object)
+
+
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self, app: QtWidgets.QApplication, midleware: Midleware):
         """
@@ -38,6 +47,16 @@ class MainWindow(QtWidgets.QMainWindow):
             GuiConfigurator.N_DEFAULT,
             self.__screen_width * GuiConfigurator.WINDOW_X_SCALE * GuiConfigurator.WINDOW_TEXT_EDIT_WIDTH_SCALE
         )
+        self.__y0_max_label, self.__y0_max_textbox = self.__configurator.create_labled_double_text_edit(
+            GuiConfigurator.Y0_MAX_LABEL,
+            GuiConfigurator.Y0_MAX_DEFAULT,
+            self.__screen_width * GuiConfigurator.WINDOW_X_SCALE * GuiConfigurator.INPUT_TEXTEDIT_WIDTH_SCALE
+        )
+        self.__count_label, self.__count_textbox = self.__configurator.create_labled_int_text_edit(
+            GuiConfigurator.FAMILY_COUNT_LABEL,
+            GuiConfigurator.FAMILY_COUNT_DEFAULT,
+            self.__screen_width * GuiConfigurator.WINDOW_X_SCALE * GuiConfigurator.INPUT_TEXTEDIT_WIDTH_SCALE
+        )
         self.__from_label, self.__from_textbox = self.__configurator.create_labled_int_text_edit(
             GuiConfigurator.INPUT_FROM_LABEL,
             GuiConfigurator.INPUT_FROM_TEXTEDIT,
@@ -53,12 +72,28 @@ class MainWindow(QtWidgets.QMainWindow):
         self.__c_euler = self.__configurator.create_check_box(GuiConfigurator.EULER_METHOD)
         self.__c_improved_euler = self.__configurator.create_check_box(GuiConfigurator.IMPROVED_EULER_METHOD)
         self.__c_runge_kutta = self.__configurator.create_check_box(GuiConfigurator.RUNGE_KUTTA_METHOD)
+        self.__c_slope_field = self.__configurator.create_check_box(GuiConfigurator.SLOPE_FIELD)
+        self.__c_live = self.__configurator.create_check_box(GuiConfigurator.LIVE_MODE)
+
+        # Live update: debounce timer and single worker, stale jobs are recognized by generation
+        self.__graph_type = GuiConfigurator.GRAPH
+        self.__live_timer = QtCore.QTimer(self)
+        self.__live_timer.setSingleShot(True)
+        self.__live_timer.setInterval(GuiConfigurator.LIVE_DEBOUNCE_MS)
+        self.__live_generation = 0
+        self.__live_future = None
+        self.__live_executor = ThreadPoolExecutor(max_workers=1)
+        self.__live_signals = _LiveSignals()
 
         # Buttons
         self.__button_lte = self.__configurator.create_button(GuiConfigurator.BUTTON_LTE)
         self.__button_gte = self.__configurator.create_button(GuiConfigurator.BUTTON_GTE)
         self.__button_gte_d = self.__configurator.create_button(GuiConfigurator.BUTTON_GTE_D)
         self.__button_plot = self.__configurator.create_button(GuiConfigurator.BUTTON_PLOT)
+        self.__button_family = self.__configurator.create_button(GuiConfigurator.BUTTON_FAMILY)
+        self.__button_dashboard = self.__configurator.create_button(GuiConfigurator.BUTTON_DASHBOARD)
+        self.__button_save = self.__configurator.create_button(GuiConfigurator.BUTTON_SAVE)
+        self.__button_load = self.__configurator.create_button(GuiConfigurator.BUTTON_LOAD)
 
         # Graph space
         self.__sc, self.__toolbar = self.__configurator.create_plot_space()
@@ -82,6 +117,14 @@ class MainWindow(QtWidgets.QMainWindow):
         from_layout = self.__configurator.create_horizontal_layout(label=self.__from_label, textedit=self.__from_textbox)
         to_layout = self.__configurator.create_horizontal_layout(label=self.__to_label, textedit=self.__to_textbox)
         from_to_layout = self.__configurator.create_horizontal_layout(from_layot=from_layout, to_layot=to_layout)
+        y0_max_layout = self.__configurator.create_horizontal_layout(label=self.__y0_max_label,
+                                                                     textedit=self.__y0_max_textbox)
+        count_layout = self.__configurator.create_horizontal_layout(label=self.__count_label,
+                                                                    textedit=self.__count_textbox)
+        family_layout = self.__configurator.create_horizontal_layout(y0_max_layot=y0_max_layout,
+                                                                     count_layot=count_layout)
+        save_load_layout = self.__configurator.create_horizontal_layout(button_save=self.__button_save,
+                                                                        button_load=self.__button_load)
 
         control_layot = self.__configurator.create_vertical_layout(
             x0_layot=x0_layout,
@@ -91,11 +134,17 @@ class MainWindow(QtWidgets.QMainWindow):
             c_euler=self.__c_euler,
             c_improved_euler=self.__c_improved_euler,
             c_runge_kutta=self.__c_runge_kutta,
+            c_slope_field=self.__c_slope_field,
+            c_live=self.__c_live,
             from_to_layot=from_to_layout,
             button_lte=self.__button_lte,
             button_gte=self.__button_gte,
             button_gte_d=self.__button_gte_d,
-            button_plot=self.__button_plot
+            button_plot=self.__button_plot,
+            button_dashboard=self.__button_dashboard,
+            family_layot=family_layout,
+            button_family=self.__button_family,
+            save_load_layot=save_load_layout
         )
         control_layot.setSpacing(GuiConfigurator.WINDOW_LAYOT_SPACING_SCALE * self.__screen_height)
         control_layot = self.__configurator.create_horizontal_layout(sc=self.__sc, control_layot=control_layot)
@@ -126,6 +175,31 @@ class MainWindow(QtWidgets.QMainWindow):
         self.__button_lte.clicked.connect(self.__button_lte_click)
         self.__button_gte.clicked.connect(self.__button_gte_click)
         self.__button_gte_d.clicked.connect(self.__button_gte_d_click)
+        self.__button_family.clicked.connect(self.__button_family_click)
+        self.__button_dashboard.clicked.connect(self.__button_dashboard_click)
+        self.__button_save.clicked.connect(self.__button_save_click)
+        self.__button_load.clicked.connect(self.__button_load_click)
+
+        # Connect live update
+        for textbox in [self.__x0_textbox, self.__y0_textbox, self.__x_textbox, self.__n_textbox]:
+            textbox.textChanged.connect(self.__schedule_live_update)
+        for checkbox in [self.__c_euler, self.__c_improved_euler, self.__c_runge_kutta, self.__c_slope_field,
+                         self.__c_live]:
+            checkbox.stateChanged.connect(self.__schedule_live_update)
+        self.__live_timer.timeout.connect(self.__start_live_job)
+        self.__live_signals.computed.connect(self.__live_computed)
+        self.__live_signals.failed.connect(self.__live_failed)
+
+    def closeEvent(self, event):
+        """
+        Stop live update on close
+
+        :param event: QCloseEvent
+        :return:
+        """
+        self.__live_generation += 1
+        self.__live_executor.shutdown(wait=False)
+        super().closeEvent(event)
 
     def __set_error_input_color(self, **kwargs: str):
         """
@@ -147,6 +221,10 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.__from_textbox.setStyleSheet(GuiConfigurator.RED_BACKGROUND)
             elif value == "to":
                 self.__to_textbox.setStyleSheet(GuiConfigurator.RED_BACKGROUND)
+            elif value == "y0_max":
+                self.__y0_max_textbox.setStyleSheet(GuiConfigurator.RED_BACKGROUND)
+            elif value == "count":
+                self.__count_textbox.setStyleSheet(GuiConfigurator.RED_BACKGROUND)
 
     def __set_default_input_color(self):
         """
@@ -160,6 +238,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.__n_textbox.setStyleSheet(GuiConfigurator.WHITE_BACKGROUND)
         self.__from_textbox.setStyleSheet(GuiConfigurator.WHITE_BACKGROUND)
         self.__to_textbox.setStyleSheet(GuiConfigurator.WHITE_BACKGROUND)
+        self.__y0_max_textbox.setStyleSheet(GuiConfigurator.WHITE_BACKGROUND)
+        self.__count_textbox.setStyleSheet(GuiConfigurator.WHITE_BACKGROUND)
 
     def __get_initial_values(self):
         """
@@ -194,6 +274,141 @@ class MainWindow(QtWidgets.QMainWindow):
         to_ = int(self.__to_textbox.text())
         return x0, y0, x, from_, to_
 
+    def __get_graph_options(self):
+        """
+        Get labels, colors and chosen methods for Midleware.compute_graphs
+
+        :return: dict of options
+        """
+        return {
+            "exact_label": GuiConfigurator.SOLUTION_TITLE,
+            "exact_color": GuiConfigurator.SOLUTION_COLOR,
+            "euler_label": GuiConfigurator.EULER_METHOD,
+            "euler_color": GuiConfigurator.EULER_METHOD_COLOR,
+            "improved_euler_label": GuiConfigurator.IMPROVED_EULER_METHOD,
+            "improved_euler_color": GuiConfigurator.IMPROVED_EULER_METHOD_COLOR,
+            "runge_kutta_label": GuiConfigurator.RUNGE_KUTTA_METHOD,
+            "runge_kutta_color": GuiConfigurator.RUNGE_KUTTA_METHOD_COLOR,
+            "show_euler": bool(self.__c_euler.checkState()),
+            "show_improved_euler": bool(self.__c_improved_euler.checkState()),
+            "show_runge_kutta": bool(self.__c_runge_kutta.checkState())
+        }
+
+    def __schedule_live_update(self):
+        """
+        Restart debounce timer, so burst of edits leads to one job
+
+        :return:
+        """
+        if self.__c_live.checkState():
+            self.__live_timer.start()
+
+    def __start_live_job(self):
+        """
+        Start live job for current input. Previous jobs become stale
+
+        :return:
+        """
+        if not self.__c_live.checkState():
+            return
+
+        self.__set_default_input_color()
+        try:
+            x0, y0, x, n = self.__get_default_input()
+        except ValueError:
+            # Input is being edited
+            self.__set_error_input_color(a="x0", b="y0", c="x", d="n")
+            return
+
+        self.__live_generation += 1
+        if self.__live_future is not None:
+            self.__live_future.cancel()
+        self.__live_future = self.__live_executor.submit(
+            self.__run_live_job, self.__live_generation, self.__graph_type, x0, y0, x, n, self.__get_graph_options()
+        )
+
+    def __run_live_job(self, generation: int, graph_type: str, x0: float, y0: float, x: float, n: int,
+                       options: dict):
+        """
+        Compute graphs in worker thread: coarse n first, then requested n.
+        Job stops at the next step of computation as soon as it becomes stale
+
+        :param generation: generation of job
+        :param graph_type: type of graph [approximation, lte, gte, dashboard]
+        :param options: options of Midleware.compute_graphs
+        :return:
+        """
+        coarse_n = n // GuiConfigurator.LIVE_COARSE_N_DIVISOR
+
+        def is_stale():
+            return generation != self.__live_generation
+
+        for stage_n in ([coarse_n, n] if coarse_n > 0 else [n]):
+            if is_stale():
+                return
+            try:
+                graphs = self.__midleware.compute_graphs(x0, y0, x, stage_n, graph_type=graph_type,
+                                                         should_stop=is_stale, **options)
+            except ValueError as e:
+                # Error of stale job is ignored
+                self.__live_signals.failed.emit(generation, e)
+                return
+            self.__live_signals.computed.emit(generation, graph_type, graphs)
+
+    def __live_computed(self, generation: int, graph_type: str, graphs: dict):
+        """
+        Plot result of live job, if it is not stale
+
+        :param generation: generation of job
+        :param graph_type: type of graph [approximation, lte, gte, dashboard]
+        :param graphs: computed graphs
+        :return:
+        """
+        if generation == self.__live_generation:
+            show_slope_field = bool(self.__c_slope_field.checkState()) and graph_type in (GuiConfigurator.GRAPH,
+                                                                                          GuiConfigurator.DASHBOARD)
+            slope_field = self.__midleware.get_slope_field() if show_slope_field else None
+            if graph_type == GuiConfigurator.DASHBOARD:
+                self.__sc.plot_dashboard(GuiConfigurator.APPROXIMATION_TITLE, GuiConfigurator.APPROXIMATION_XLABEL,
+                                         self.__midleware.get_dashboard_ylabels(GuiConfigurator.APPROXIMATION_YLABEL),
+                                         slope_field=slope_field, **graphs)
+            else:
+                self.__sc.plot(GuiConfigurator.APPROXIMATION_TITLE + " | " + graph_type,
+                               GuiConfigurator.APPROXIMATION_XLABEL, GuiConfigurator.APPROXIMATION_YLABEL,
+                               slope_field=slope_field, **graphs)
+
+    def __live_failed(self, generation: int, e: ValueError):
+        """
+        Show error of live job, if it is not stale
+
+        :param generation: generation of job
+        :param e: error
+        :return:
+        """
+        if generation == self.__live_generation:
+            if len(e.args) > 1:
+                self.__set_error_input_color(**e.args[1])
+            self.statusBar().showMessage(e.args[0], GuiConfigurator.LIVE_DEBOUNCE_MS * 10)
+
+    def __stop_live_job(self):
+        """
+        Make current live job stale. It solves its own copies of methods, so it is not waited for
+
+        :return:
+        """
+        self.__live_generation += 1
+
+    def __get_family_input(self):
+        """
+        Get x0, y0, x, n, y0 max, count from textedits
+
+        :return: x0, y0, x, n, y0 max, count
+        """
+        x0, y0, x, n = self.__get_default_input()
+        y0_max = float(self.__y0_max_textbox.text().replace(",", '.'))
+        count = int(self.__count_textbox.text())
+        return x0, y0, x, n, y0_max, count
+
     def __plot_result(self, graph_type: str):
         """
         Plot graphs by given input
@@ -201,12 +416,18 @@ class MainWindow(QtWidgets.QMainWindow):
         :param graph_type: type of grap [approximation, lte, gte...]
         :return:
         """
+        self.__graph_type = graph_type
+        if self.__c_live.checkState():
+            # Live worker computes graphs
+            self.__start_live_job()
+            return
+
+        # Result of live job must not replace synchronous plot
+        self.__stop_live_job()
         self.__set_default_input_color()
         try:
             x0, y0, x, n = self.__get_default_input()
-            show_euler = bool(self.__c_euler.checkState())
-            show_improved_euler = bool(self.__c_improved_euler.checkState())
-            show_runge_kutta = bool(self.__c_runge_kutta.checkState())
+            options = self.__get_graph_options()
         except ValueError:
             # If no input provided
             self.__set_error_input_color(a="x0", b="y0", c="x", d="n")
@@ -224,16 +445,9 @@ class MainWindow(QtWidgets.QMainWindow):
                 title=GuiConfigurator.APPROXIMATION_TITLE,
                 xlabel=GuiConfigurator.APPROXIMATION_XLABEL,
                 ylabel=GuiConfigurator.APPROXIMATION_YLABEL,
-                exact_label=GuiConfigurator.SOLUTION_TITLE,
-                exact_color=GuiConfigurator.SOLUTION_COLOR,
-                euler_label=GuiConfigurator.EULER_METHOD,
-                euler_color=GuiConfigurator.EULER_METHOD_COLOR,
-                improved_euler_label=GuiConfigurator.IMPROVED_EULER_METHOD,
-                improved_euler_color=GuiConfigurator.IMPROVED_EULER_METHOD_COLOR,
-                runge_kutta_label=GuiConfigurator.RUNGE_KUTTA_METHOD,
-                runge_kutta_color=GuiConfigurator.RUNGE_KUTTA_METHOD_COLOR,
-                show_euler=show_euler, show_improved_euler=show_improved_euler, show_runge_kutta=show_runge_kutta,
-                graph_type=graph_type
+                graph_type=graph_type,
+                slope_field=bool(self.__c_slope_field.checkState()),
+                **options
             )
         except ValueError as e:
             # If some error is occuried
@@ -265,12 +479,21 @@ class MainWindow(QtWidgets.QMainWindow):
         """
         self.__plot_result(GuiConfigurator.GTE)
 
+    def __button_dashboard_click(self):
+        """
+        When dashboard button is clicked
+
+        :return:
+        """
+        self.__plot_result(GuiConfigurator.DASHBOARD)
+
     def __button_gte_d_click(self):
         """
         When gte dependency button is clicked
 
         :return:
         """
+        self.__stop_live_job()
         self.__set_default_input_color()
         try:
             x0, y0, x, from_, to_ = self.__get_from_to_input()
@@ -308,3 +531,70 @@ class MainWindow(QtWidgets.QMainWindow):
             if len(e.args) > 1:
                 self.__set_error_input_color(**e.args[1])
             self.__configurator.create_message_box(GuiConfigurator.INPUT_ERROR, e.args[0])
+
+    def __button_family_click(self):
+        """
+        When family button is clicked
+
+        :return:
+        """
+        self.__stop_live_job()
+        self.__set_default_input_color()
+        try:
+            x0, y0, x, n, y0_max, count = self.__get_family_input()
+            options = self.__get_graph_options()
+        except ValueError:
+            # If no input provided
+            self.__set_error_input_color(a="x0", b="y0", c="x", d="n", e="y0_max", f="count")
+            self.__configurator.create_message_box(GuiConfigurator.INPUT_ERROR, "No input provided")
+            return
+
+        try:
+            # Give task to midleware
+            self.__midleware.plot_family(
+                self.__sc,
+                x0,
+                np.linspace(y0, y0_max, count),
+                x,
+                n,
+                title=GuiConfigurator.FAMILY_TITLE,
+                xlabel=GuiConfigurator.APPROXIMATION_XLABEL,
+                ylabel=GuiConfigurator.APPROXIMATION_YLABEL,
+                **options
+            )
+        except ValueError as e:
+            # If some error occuried
+            if len(e.args) > 1:
+                self.__set_error_input_color(**e.args[1])
+            self.__configurator.create_message_box(GuiConfigurator.INPUT_ERROR, e.args[0])
+
+    def __button_save_click(self):
+        """
+        When save button is clicked
+
+        :return:
+        """
+        path = self.__configurator.get_save_file_name(GuiConfigurator.BUTTON_SAVE)
+        if not path:
+            return
+
+        try:
+            self.__midleware.save_plot(self.__sc, path)
+        except (ValueError, OSError) as e:
+            self.__configurator.create_message_box(GuiConfigurator.FILE_ERROR, str(e.args[0]))
+
+    def __button_load_click(self):
+        """
+        When load button is clicked
+
+        :return:
+        """
+        path = self.__configurator.get_open_file_name(GuiConfigurator.BUTTON_LOAD)
+        if not path:
+            return
+
+        self.__stop_live_job()
+        try:
+            self.__midleware.load_plot(self.__sc, path)
+        except (ValueError, KeyError, OSError) as e:
+            self.__configurator.create_message_box(GuiConfigurator.FILE_ERROR, str(e.args[0]))
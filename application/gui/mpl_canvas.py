@@ -1,8 +1,17 @@
+import numpy as np
 import matplotlib.pyplot as plt
+from typing import List, Optional
+from matplotlib.quiver import Quiver
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from application.replot import DASHBOARD, FAMILY, PLOT, create_dashboard_axes, draw_dashboard, draw_plot
+from application.slope_field import SlopeField
 
 
 class MplCanvas(FigureCanvas):
+    # Style of slope field
+    SLOPE_FIELD_COLOR = "0.6"
+    SLOPE_FIELD_WIDTH = 0.002
+
     def __init__(self, parent, width: int, height: int, dpi: int = 100):
         """
         Init MplCanvas
@@ -17,27 +26,145 @@ class MplCanvas(FigureCanvas):
         super().__init__(self.fig)
         self.setParent(parent)
 
-    def plot(self, title: str = None, xlabel: str = None, ylabel: str = None, **kwargs):
+        self.__slope_field: Optional[SlopeField] = None
+        self.__quiver: Optional[Quiver] = None
+        self.__drawing_slope_field = False
+        self.__last_plot: Optional[tuple] = None
+
+    def get_last_plot(self):
+        """
+        Get last plotted graphs
+
+        :return: kind of plot, title, xlabel, ylabel, graphs or None
+        """
+        return self.__last_plot
+
+    def __reset_axes(self, panels: int):
+        """
+        Clear axes. Axes are recreated, if number of panels is changed
+
+        :param panels: number of axes, which share x axis
+        :return: axes from top to bottom
+        """
+        if len(self.fig.axes) == panels and panels == 1:
+            self.ax.cla()
+            return [self.ax]
+
+        self.fig.clear()
+        axes = create_dashboard_axes(self.fig, panels)
+        self.ax = axes[0]
+        return axes
+
+    def __connect_view_callbacks(self):
+        """
+        Redraw slope field, when view of top axes is changed.
+        Clearing of axes disconnects callbacks, so they are connected after every plot
+
+        :return:
+        """
+        self.ax.callbacks.connect("xlim_changed", self.__view_changed)
+        self.ax.callbacks.connect("ylim_changed", self.__view_changed)
+
+    def __draw_slope_field(self):
+        """
+        Draw slope field in current view
+
+        :return:
+        """
+        if self.__quiver is not None and self.__quiver.axes is not None:
+            self.__quiver.remove()
+        self.__quiver = None
+        if self.__slope_field is None:
+            return
+
+        self.__drawing_slope_field = True
+        try:
+            x, y, u, v = self.__slope_field.evaluate(self.ax.get_xlim(), self.ax.get_ylim())
+            self.__quiver = Quiver(
+                self.ax, x, y, np.ma.masked_invalid(u), np.ma.masked_invalid(v),
+                angles="xy", pivot="mid", color=self.SLOPE_FIELD_COLOR, width=self.SLOPE_FIELD_WIDTH,
+                headwidth=0, headlength=0, headaxislength=0
+            )
+            # Slope field must not change view
+            self.ax.add_collection(self.__quiver, autolim=False)
+        finally:
+            self.__drawing_slope_field = False
+
+    def __view_changed(self, ax):
+        """
+        When view is panned or zoomed
+
+        :param ax: changed axes
+        :return:
+        """
+        if self.__slope_field is not None and not self.__drawing_slope_field:
+            self.__draw_slope_field()
+            self.draw_idle()
+
+    def plot(self, title: str = None, xlabel: str = None, ylabel: str = None,
+             slope_field: Optional[SlopeField] = None, **kwargs):
         """
         Plot graphs
 
         :param title: title of plot
         :param xlabel: x axis name
         :param ylabel: y axis name
+        :param slope_field: slope field to draw under graphs
         :param kwargs: decodes graph info: ["x": values, "y": values, "color": color of graph, "label": name of graph]
         :return:
         """
-        plt.cla()
+        self.__reset_axes(1)
+        self.__slope_field = None
+        self.__quiver = None
+        self.__last_plot = (PLOT, title, xlabel, ylabel, kwargs)
 
-        self.ax.grid()
-        self.ax.set(xlabel=xlabel, ylabel=ylabel, title=title)
-        for label, graph_info in kwargs.items():
-            self.ax.plot(
-                graph_info["x"],
-                graph_info["y"],
-                color=graph_info.get("color", None),
-                label=graph_info.get("label", None)
-            )
+        draw_plot(self.ax, PLOT, title, xlabel, ylabel, kwargs)
+        self.__slope_field = slope_field
+        self.__draw_slope_field()
+
+        self.__connect_view_callbacks()
+        self.draw()
+
+    def plot_dashboard(self, title: str = None, xlabel: str = None, ylabels: List[str] = (),
+                       slope_field: Optional[SlopeField] = None, **kwargs):
+        """
+        Plot graphs on linked panels, which share x axis
+
+        :param title: title of top panel
+        :param xlabel: x axis name
+        :param ylabels: y axis names of panels from top to bottom
+        :param slope_field: slope field to draw under graphs of top panel
+        :param kwargs: decodes graph info: ["x": values, "y": values, "color": color of graph, "label": name of graph,
+                       "panel": index of panel]
+        :return:
+        """
+        axes = self.__reset_axes(len(ylabels))
+        self.__slope_field = None
+        self.__quiver = None
+        self.__last_plot = (DASHBOARD, title, xlabel, list(ylabels), kwargs)
+
+        draw_dashboard(axes, title, xlabel, ylabels, kwargs)
+        self.__slope_field = slope_field
+        self.__draw_slope_field()
+
+        self.__connect_view_callbacks()
+        self.draw()
+
+    def plot_family(self, title: str = None, xlabel: str = None, ylabel: str = None, **kwargs):
+        """
+        Plot families of graphs, every family is drawn by one LineCollection
+
+        :param title: title of plot
+        :param xlabel: x axis name
+        :param ylabel: y axis name
+        :param kwargs: decodes family info: ["x": values, "y": values for every curve,
+                       "color": color of family, "label": name of family]
+        :return:
+        """
+        self.__reset_axes(1)
+        self.__slope_field = None
+        self.__quiver = None
+        self.__last_plot = (FAMILY, title, xlabel, ylabel, kwargs)
 
-        plt.legend()
+        draw_plot(self.ax, FAMILY, title, xlabel, ylabel, kwargs)
         self.draw()
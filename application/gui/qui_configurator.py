@@ -3,6 +3,7 @@ from PyQt5 import QtWidgets, QtGui
 from PyQt5.QtGui import QIcon, QFont, QDoubleValidator
 from matplotlib.backends.backend_qt5 import NavigationToolbar2QT as NavigationToolbar
 from mpl_canvas import MplCanvas
+from application import interval
 
 
 def _getDoubleValidator(_min: float, _max: float, decimals: int):
@@ -46,6 +47,8 @@ class GuiConfigurator:
     APPROXIMATION_XLABEL = "x"
     APPROXIMATION_YLABEL = "y"
 
+    FAMILY_TITLE = "Family of solutions"
+
     GTE_DEPENDENCY_TITLE = "MAX GTE(n)"
     GTE_DEPENDENCY_XLABEL = "n"
     GTE_DEPENDENCY_YLABEL = "max GTE"
@@ -55,11 +58,16 @@ class GuiConfigurator:
     X_LABEL = "X = "
     N_LABEL = "N = "
 
+    Y0_MAX_LABEL = "Y0 max = "
+    FAMILY_COUNT_LABEL = "Count = "
+
     X0_DEFAULT = 1.0
     Y0_DEFAULT = 1.0
     X_DEFAULT = 6
     N_DEFAULT = 5
-    MINIMAL_DISTANCE_BETWEEN_X_X0 = 0.1
+    Y0_MAX_DEFAULT = 5.0
+    FAMILY_COUNT_DEFAULT = 20
+    MINIMAL_DISTANCE_BETWEEN_X_X0 = interval.MINIMAL_DISTANCE_BETWEEN_X_X0
 
     STANDART_DOUBLE_VALIDATOR = _getDoubleValidator(-9999, 9999, 4)
     STANDART_INT_VALIDATOR = QtGui.QIntValidator(1, 9999)
@@ -68,10 +76,22 @@ class GuiConfigurator:
     IMPROVED_EULER_METHOD = "Improved Euler method"
     RUNGE_KUTTA_METHOD = "Runge-Kutta method"
 
+    SLOPE_FIELD = "Slope field"
+    LIVE_MODE = "Live update"
+    LIVE_DEBOUNCE_MS = 300
+    LIVE_COARSE_N_DIVISOR = 10
+
     BUTTON_LTE = "View LTE"
     BUTTON_GTE = "View GTE"
     BUTTON_GTE_D = "View MAX GTE(N)"
     BUTTON_PLOT = "Plot"
+    BUTTON_FAMILY = "View family"
+    BUTTON_DASHBOARD = "View all"
+    BUTTON_SAVE = "Save results"
+    BUTTON_LOAD = "Load results"
+
+    RESULTS_FILTER = "Results (*.npz *.cols)"
+    RESULTS_DEFAULT_PATH = "results.npz"
 
     SOLUTION_TITLE = "Exact solution"
     SOLUTION_COLOR = "b"
@@ -87,8 +107,10 @@ class GuiConfigurator:
     LTE = "LTE"
     GTE = "GTE"
     GRAPH = "GRAPH"
+    DASHBOARD = "DASHBOARD"
 
     INPUT_ERROR = "Input error"
+    FILE_ERROR = "File error"
 
     def __init__(self, window: QtWidgets.QMainWindow, app: QtWidgets.QApplication):
         """
@@ -210,6 +232,27 @@ class GuiConfigurator:
         toolbar = NavigationToolbar(sc, self.__window)
         return sc, toolbar
 
+    def get_save_file_name(self, title: str):
+        """
+        Ask path of results file to save
+
+        :param title: dialog title
+        :return: path or empty string if canceled
+        """
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(self.__window, title, self.RESULTS_DEFAULT_PATH,
+                                                        self.RESULTS_FILTER)
+        return path
+
+    def get_open_file_name(self, title: str):
+        """
+        Ask path of results file to open
+
+        :param title: dialog title
+        :return: path or empty string if canceled
+        """
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(self.__window, title, "", self.RESULTS_FILTER)
+        return path
+
     def create_message_box(self, title: str, text: str):
         """
         Create and show message box
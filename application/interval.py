@@ -0,0 +1,56 @@
+# Min absolute value of interval ends, target function is singular at zero
+EPSILON = 10 ** -3
+MINIMAL_DISTANCE_BETWEEN_X_X0 = 0.1
+
+
+def _check_validity_of_interval(x0: float, x: float):
+    """
+    Check if x0 smaller then x
+
+    :param x0: float
+    :param x: float
+    :return: bool
+    """
+    return x0 < x
+
+
+def _check_interval_for_zero_holding(x0: float, x: float):
+    """
+    Check if x or x0 to small by absolute value.
+    Assumation: (x0, x) - valid interval
+
+    :param x0:
+    :param x:
+    :return:
+    """
+    return x0 > EPSILON or x < -EPSILON
+
+
+def _check_distance(x0: float, x: float):
+    """
+    Check distanse between x and x0
+
+    :param x0: float
+    :param x: float
+    :return: bool
+    """
+    return x - x0 > MINIMAL_DISTANCE_BETWEEN_X_X0
+
+
+def check_x_x0(x0: float, x: float):
+    """
+    Check x and x0 before computation.
+    Raise excaption if they are bad.
+
+    :param x0: float
+    :param x: float
+    :return:
+    """
+    if not _check_validity_of_interval(x0, x):
+        raise ValueError("X0 must be less then x!", {"x0": "x0", "x": "x"})
+
+    if not _check_interval_for_zero_holding(x0, x):
+        raise ValueError("Interval should not contain too small values", {"x0": "x0", "x": "x"})
+
+    if not _check_distance(x0, x):
+        raise ValueError("X0 and x are too close!", {"x0": "x0", "x": "x"})
@@ -0,0 +1,42 @@
+import numpy as np
+from typing import Union
+
+
+class DenseOutput:
+    def __init__(self, x: np.ndarray, y: np.ndarray, dydx: np.ndarray):
+        """
+        Init dense output: piecewise cubic Hermite interpolation of computed solution
+
+        :param x: grid (increasing)
+        :param y: values at grid
+        :param dydx: derivatives at grid
+        """
+        self._x = np.asarray(x)
+        self._y = np.asarray(y)
+        self._dydx = np.asarray(dydx)
+
+    def __call__(self, x: Union[float, np.ndarray]):
+        """
+        Evaluate interpolation
+
+        :param x: points inside of grid
+        :return: interpolated values
+        """
+        x = np.asarray(x, dtype=self._y.dtype)
+        if np.any((x < self._x[0]) | (x > self._x[-1])):
+            raise ValueError("Dense output is defined only inside of grid!", {"x": "x"})
+        if len(self._x) == 1:
+            return np.full_like(x, self._y[0])
+
+        i = np.clip(np.searchsorted(self._x, x, side="right") - 1, 0, len(self._x) - 2)
+        h = self._x[i + 1] - self._x[i]
+        t = (x - self._x[i]) / h
+        t2 = t * t
+        t3 = t2 * t
+
+        # Hermite basis
+        h00 = 2 * t3 - 3 * t2 + 1
+        h10 = t3 - 2 * t2 + t
+        h01 = -2 * t3 + 3 * t2
+        h11 = t3 - t2
+        return h00 * self._y[i] + h10 * h * self._dydx[i] + h01 * self._y[i + 1] + h11 * h * self._dydx[i + 1]
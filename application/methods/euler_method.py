@@ -1,13 +1,15 @@
-from typing import Callable
+from typing import Callable, Optional
 from numerical_method import NumericalMethod
 
 
 class EulerMethod(NumericalMethod):
-    def __init__(self, f: Callable[[float, float], float], solution: Callable[[float], float]):
+    ORDER = 1
+
+    def __init__(self, f: Callable[[float, float], float], solution: Optional[Callable[[float], float]]):
         """
         Init Euler method
 
         :param f: target method
-        :param solution: analytical solution
+        :param solution: analytical solution or None
         """
-        super().__init__(lambda x, y, h: f(x, y), solution)
+        super().__init__(lambda x, y, h: f(x, y), solution, f, lambda x, y, h, k: k)
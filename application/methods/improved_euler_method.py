@@ -1,13 +1,18 @@
-from typing import Callable
+from typing import Callable, Optional
 from application.methods.numerical_method import NumericalMethod
 
 
 class ImprovedEulerMethod(NumericalMethod):
-    def __init__(self, f: Callable[[float, float], float], solution: Callable[[float], float]):
+    ORDER = 2
+
+    def __init__(self, f: Callable[[float, float], float], solution: Optional[Callable[[float], float]]):
         """
         Init Improved Euler method
 
         :param f: target method
-        :param solution: analytical solution
+        :param solution: analytical solution or None
         """
-        super().__init__(lambda x, y, h: (f(x, y) + f(x + h, y + h * f(x, y))) / 2, solution)
+        def increment(x: float, y: float, h: float, k: float):
+            return (k + f(x + h, y + h * k)) / 2
+
+        super().__init__(lambda x, y, h: increment(x, y, h, f(x, y)), solution, f, increment)
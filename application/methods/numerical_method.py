@@ -1,23 +1,103 @@
+import time
 import numpy as np
-from typing import Callable, Optional
+from typing import Callable, List, Optional, Union
+from application.methods.dense_output import DenseOutput
+from application.checkpoint import load_checkpoint, problem_hash, save_checkpoint
 
 
 class NumericalMethod:
-    def __init__(self, a: Callable[[float, float, float], float], solution: Callable[[float], float]):
+    # Order of accuracy, global error is O(h ** ORDER)
+    ORDER = 1
+
+    def __init__(self, a: Callable[[float, float, float], float], solution: Optional[Callable[[float], float]],
+                 f: Optional[Callable[[float, float], float]] = None,
+                 a_k: Optional[Callable[[float, float, float, float], float]] = None):
         """
-        Init abstract numerical method
+        Init abstract numerical method.
+        Without analytical solution lte and gte are estimated by step doubling and Richardson extrapolation
 
         :param a: increment function from R^3 -> R
-        :param solution: analytical solution
+        :param solution: analytical solution or None
+        :param f: target function, increment function with zero step is used if it is not given
+        :param a_k: increment function from R^4 -> R, which takes value of target function at start of step.
+                    With it and f compute stores values of target function for dense output
         """
         self._a = a
+        self._a_k = a_k if f is not None else None
+        self._f = f
         self._solution = solution
         self._x: Optional[np.ndarray] = None
         self._y: Optional[np.ndarray] = None
         self._lte: Optional[np.ndarray] = None
         self._gte: Optional[np.ndarray] = None
+        self._dydx: Optional[np.ndarray] = None
+        self._reference: Optional[np.ndarray] = None
         self._gte_d: Optional[np.ndarray] = None
         self._ns: Optional[np.ndarray] = None
+        self._event_x: Optional[float] = None
+
+    @staticmethod
+    def _get_event_functions(threshold: Optional[float], event: Optional[Callable[[float, float], float]]):
+        """
+        Get list of event functions. Event happens when event function changes sign
+
+        :param threshold: max allowed absolute value of y
+        :param event: user event function from R^2 -> R
+        :return: list of functions from R^2 -> R
+        """
+        events = []
+        if threshold is not None:
+            events.append(lambda x, y: threshold - abs(y))
+        if event is not None:
+            events.append(event)
+        return events
+
+    def _locate_event(self, event: Callable[[float, float], float], x0: float, y0: float, h: float,
+                      tolerance: float = 10 ** -12, max_iterations: int = 100):
+        """
+        Find step, which leads to sign change of event function (bisection)
+
+        :param event: event function from R^2 -> R
+        :param x0: start of step (x component)
+        :param y0: start of step (y component)
+        :param h: full step, event function must change sign on it
+        :param tolerance: relative tolerance of step
+        :param max_iterations: max number of bisections
+        :return: step in (0, h]
+        """
+        g0 = event(x0, y0)
+        left, right = 0.0, h
+        for _ in range(max_iterations):
+            if right - left <= tolerance * h:
+                break
+            middle = (left + right) / 2
+            g = event(x0 + middle, y0 + middle * self._a(x0, y0, middle))
+            if g * g0 > 0:
+                left = middle
+            else:
+                right = middle
+        return right
+
+    def _find_event_step(self, events: List[Callable[[float, float], float]], x0: float, y0: float, h: float,
+                         x1: float, y1: float):
+        """
+        Find the earliest event on the step
+
+        :param events: event functions
+        :param x0: start of step (x component)
+        :param y0: start of step (y component)
+        :param h: step
+        :param x1: end of step (x component)
+        :param y1: end of step (y component)
+        :return: step to event or None if there is no event
+        """
+        step = None
+        for event in events:
+            g0 = event(x0, y0)
+            if g0 != 0 and g0 * event(x1, y1) <= 0:
+                event_step = self._locate_event(event, x0, y0, h)
+                step = event_step if step is None else min(step, event_step)
+        return step
 
     def _get_constant_solution(self, x0: float, y0: float):
         """
@@ -27,11 +107,124 @@ class NumericalMethod:
         :param y0: start point (y component)
         :return: function from float to float
         """
+        if self._solution is None:
+            raise ValueError("Analytical solution is unknown!")
         if abs(self._solution(x0)) > 10**-9 and abs(y0) > 10**-2:
             return lambda x: self._solution(x) * y0 / self._solution(x0)
         else:
             raise ValueError("Input initial values lead to arithmetical error!", {"x0": "x0", "y0": "y0"})
 
+    def _get_family_solution(self, x0: float, y0: np.ndarray):
+        """
+        Get analytical solutions for array of initial values
+
+        :param x0: start point (x component)
+        :param y0: array of start points (y component)
+        :return: function from array of x to array of shape (len(y0), len(x))
+        """
+        if self._solution is None:
+            raise ValueError("Analytical solution is unknown!")
+        if abs(self._solution(x0)) > 10**-9 and np.all(np.absolute(y0) > 10**-2):
+            scale = y0 / self._solution(x0)
+            return lambda x: np.multiply.outer(scale, self._solution(x))
+        else:
+            raise ValueError("Input initial values lead to arithmetical error!", {"x0": "x0", "y0": "y0"})
+
+    def _increment(self, x: Union[float, np.ndarray], y: Union[float, np.ndarray], h: Union[float, np.ndarray]):
+        """
+        Get values of increment function for arrays.
+        Increment function, which accepts only scalars, is evaluated point by point
+
+        :param x: x components
+        :param y: y components
+        :param h: steps
+        :return: values of increment function
+        """
+        try:
+            return self._a(x, y, h)
+        except TypeError:
+            return np.vectorize(self._a)(x, y, h)
+
+    def _step_increment(self, i: int, h: float):
+        """
+        Get value of increment function at point of last computation.
+        Stored value of target function is reused, if method accepts it
+
+        :param i: index of point
+        :param h: step
+        :return: value of increment function
+        """
+        if self._dydx is not None:
+            return self._a_k(self._x[i], self._y[i], h, self._dydx[i])
+        return self._a(self._x[i], self._y[i], h)
+
+    def _get_richardson_factor(self):
+        """
+        Get factor of Richardson extrapolation: error of approximation with step h is
+        (y(h / 2) - y(h)) * 2 ** p / (2 ** p - 1), where p is order of method
+
+        :return: factor
+        """
+        return 2 ** self.ORDER / (2 ** self.ORDER - 1)
+
+    def _estimate_errors(self, x_: np.ndarray, y_: np.ndarray):
+        """
+        Estimate lte and gte without analytical solution.
+        Every step is repeated as two half steps (solve with 2N intervals shares every second point with solve
+        with N intervals), Richardson extrapolation of both solves is reference of higher order.
+        Lte is estimated from one step and two half steps, which start at the same point of 2N solve
+
+        :param x_: grid (steps may differ, if computation is stopped by event)
+        :param y_: approximation, last axis corresponds to grid
+        :return: arrays of lte, gte and reference of shape of y_
+        """
+        steps = np.diff(x_)
+        half_steps = steps / 2
+        fine = np.empty_like(y_)
+        fine[..., 0] = y_[..., 0]
+
+        with np.errstate(all="ignore"):
+            for i in range(1, len(x_)):
+                middle = fine[..., i - 1] + half_steps[i - 1] * self._increment(x_[i - 1], fine[..., i - 1],
+                                                                                half_steps[i - 1])
+                fine[..., i] = middle + half_steps[i - 1] * self._increment(x_[i - 1] + half_steps[i - 1], middle,
+                                                                             half_steps[i - 1])
+
+            factor = self._get_richardson_factor()
+            reference = y_ + (fine - y_) * factor
+            one_step = fine[..., :-1] + steps * self._increment(x_[:-1], fine[..., :-1], steps)
+            lte = np.zeros_like(y_)
+            lte[..., 1:] = (fine[..., 1:] - one_step) * factor
+
+        return lte, reference - y_, reference
+
+    def has_solution(self):
+        """
+        Check whether analytical solution is known
+
+        :return: bool
+        """
+        return self._solution is not None
+
+    @staticmethod
+    def get_grid(x0: float, x: float, n: int, dtype: type = np.float64):
+        """
+        Get grid, which is used by compute
+
+        :param x0: start point
+        :param x: end point
+        :param n: number of intervals
+        :param dtype: precision of computation (float32, float64, longdouble)
+        :return: array of x, step
+        """
+        scalar = np.dtype(dtype).type
+        h = (scalar(x) - scalar(x0)) / scalar(n)
+        x_ = np.empty(n + 1, dtype=dtype)
+        x_[0] = x0
+        for i in range(1, n + 1):
+            x_[i] = x_[i - 1] + h
+        return x_, h
+
     def solution(self, x0: float, y0: float, x: float, dpx: int = 200):
         """
         Get points of analytical solution
@@ -45,41 +238,220 @@ class NumericalMethod:
         x_array = np.linspace(x0, x, int((x - x0) * dpx))
         return x_array, np.apply_along_axis(self._get_constant_solution(x0, y0), 0, x_array)
 
-    def compute(self, x0: float, y0: float, x: float, n: int):
+    def solution_family(self, x0: float, y0: np.ndarray, x: float, dpx: int = 200):
+        """
+        Get points of analytical solutions for array of initial values
+
+        :param x0: start point (x component)
+        :param y0: array of start points (y component)
+        :param x: end point
+        :param dpx: number of points per unit
+        :return: array of x, array of corresponding y of shape (len(y0), len(x))
+        """
+        x_array = np.linspace(x0, x, int((x - x0) * dpx))
+        return x_array, self._get_family_solution(x0, np.asarray(y0, dtype=float))(x_array)
+
+    def compute(self, x0: float, y0: float, x: float, n: int, threshold: Optional[float] = None,
+                event: Optional[Callable[[float, float], float]] = None, dtype: type = np.float64,
+                should_stop: Optional[Callable[[], bool]] = None):
         """
-        Compute approximation, lte and gte
+        Compute approximation, lte and gte.
+        Computation stops early if y becomes NaN/inf, exceeds threshold or event function changes sign.
+        In that case arrays are truncated at event point.
+        Without analytical solution lte and gte are estimated by step doubling.
+        Should_stop is checked every step, computation is cancelled with ValueError when it returns True
 
         :param x0: start point (x component)
         :param y0: start point (y component)
         :param x: end point (x component)
         :param n: number of intervals
+        :param threshold: max allowed absolute value of y
+        :param event: event function from R^2 -> R, computation stops at its root
+        :param dtype: precision of computation (float32, float64, longdouble)
+        :param should_stop: function without arguments, which tells whether computation is not needed anymore
         :return: array of x, array of corresponding y, array of corresponding lte, array of corresponding gte
         """
-        self._x = np.empty(n + 1)
-        self._y = np.empty(n + 1)
-        self._lte = np.empty(n + 1)
-        self._gte = np.empty(n + 1)
-        constant_solution = self._get_constant_solution(x0, y0)
+        scalar = np.dtype(dtype).type
+        self._x = np.empty(n + 1, dtype=dtype)
+        self._y = np.empty(n + 1, dtype=dtype)
+        self._dydx = np.empty(n + 1, dtype=dtype) if self._a_k is not None else None
+        self._lte = np.empty(n + 1, dtype=dtype)
+        self._gte = np.empty(n + 1, dtype=dtype)
+        self._reference = None
+        constant_solution = self._get_constant_solution(x0, y0) if self._solution is not None else None
 
-        h = (x - x0) / n
+        h = (scalar(x) - scalar(x0)) / scalar(n)
         self._x[0] = x0
         self._y[0] = y0
         self._lte[0] = 0.0
         self._gte[0] = 0.0
+        self._event_x = None
+        events = self._get_event_functions(threshold, event)
+        last = n
 
         # Compute values and lte
         for i in range(1, n + 1):
+            if should_stop is not None and should_stop():
+                raise ValueError("Computation is stopped!")
+            step = h
             self._x[i] = self._x[i - 1] + h
-            self._y[i] = self._y[i - 1] + h * self._a(self._x[i - 1], self._y[i - 1], h)
-            self._lte[i] = constant_solution(self._x[i]) - constant_solution(self._x[i - 1]) - h * self._a(
-                self._x[i - 1], constant_solution(self._x[i - 1]), h
-            )
+            if self._dydx is not None:
+                self._dydx[i - 1] = self._f(self._x[i - 1], self._y[i - 1])
+            self._y[i] = self._y[i - 1] + h * self._step_increment(i - 1, h)
+
+            # Blow-up, keep only finite values
+            if not np.isfinite(self._y[i]):
+                last = i - 1
+                self._event_x = self._x[last]
+                break
+
+            if events:
+                event_step = self._find_event_step(events, self._x[i - 1], self._y[i - 1], h, self._x[i], self._y[i])
+                if event_step is not None:
+                    step = event_step
+                    self._x[i] = self._x[i - 1] + step
+                    self._y[i] = self._y[i - 1] + step * self._step_increment(i - 1, step)
+                    last = i
+                    self._event_x = self._x[last]
+
+            if constant_solution is not None:
+                self._lte[i] = constant_solution(self._x[i]) - constant_solution(self._x[i - 1]) - step * self._a(
+                    self._x[i - 1], constant_solution(self._x[i - 1]), step
+                )
+            if self._event_x is not None:
+                break
+
+        # Truncate at event
+        self._x = self._x[:last + 1]
+        self._y = self._y[:last + 1]
+        self._lte = self._lte[:last + 1]
+        if self._dydx is not None:
+            self._dydx = self._dydx[:last + 1]
+            self._dydx[last] = self._f(self._x[last], self._y[last])
 
         # Compute gte
-        self._gte = np.apply_along_axis(constant_solution, 0, self._x) - self._y
+        if constant_solution is not None:
+            self._gte = np.apply_along_axis(constant_solution, 0, self._x) - self._y
+        else:
+            self._lte, self._gte, self._reference = self._estimate_errors(self._x, self._y)
 
         return self._x, self._y, self._lte, self._gte
 
+    def compute_ensemble(self, x0: float, y0: np.ndarray, x: float, n: int, threshold: Optional[float] = None,
+                         dtype: type = np.float64):
+        """
+        Compute approximation, lte and gte for array of initial values at once.
+        Trajectory, which becomes NaN/inf or exceeds threshold, is NaN after that.
+        Computation stops early if all trajectories are stopped.
+        Without analytical solution lte and gte are estimated by step doubling.
+        Target function, which accepts only scalars, is evaluated point by point
+
+        :param x0: start point (x component)
+        :param y0: array of start points (y component)
+        :param x: end point (x component)
+        :param n: number of intervals
+        :param threshold: max allowed absolute value of y
+        :param dtype: precision of computation (float32, float64, longdouble)
+        :return: array of x, arrays of y, lte and gte of shape (len(y0), n + 1)
+        """
+        y0 = np.asarray(y0, dtype=dtype)
+        x_, h = self.get_grid(x0, x, n, dtype)
+        y_ = np.full((len(y0), n + 1), np.nan, dtype=dtype)
+        family_solution = self._get_family_solution(x0, y0) if self._solution is not None else None
+        y_[:, 0] = y0
+
+        # Compute values of all trajectories simultaneously
+        with np.errstate(all="ignore"):
+            for i in range(1, n + 1):
+                y_[:, i] = y_[:, i - 1] + h * self._increment(x_[i - 1], y_[:, i - 1], h)
+                stopped = ~np.isfinite(y_[:, i])
+                if threshold is not None:
+                    stopped |= np.absolute(y_[:, i]) > threshold
+                y_[stopped, i] = np.nan
+                if np.all(stopped):
+                    break
+
+            # Compute lte and gte
+            if family_solution is not None:
+                exact = family_solution(x_).astype(dtype)
+                lte = np.zeros_like(y_)
+                lte[:, 1:] = exact[:, 1:] - exact[:, :-1] - h * self._increment(x_[:-1], exact[:, :-1], h)
+                gte = exact - y_
+            else:
+                lte, gte, _ = self._estimate_errors(x_, y_)
+            lte[np.isnan(y_)] = np.nan
+
+        return x_, y_, lte, gte
+
+    def get_definition_hash(self, *params):
+        """
+        Get hash of problem definition: method, increment function, analytical solution and parameters
+
+        :param params: parameters of computation
+        :return: hex digest
+        """
+        return problem_hash(type(self).__name__, self._a, self._solution, *params)
+
+    def slope(self, x: Union[float, np.ndarray], y: Union[float, np.ndarray]):
+        """
+        Get values of target function, it is evaluated once per point.
+        Without target function increment function of consistent method with zero step is used
+        (it may evaluate target function several times per point)
+
+        :param x: x components
+        :param y: y components
+        :return: values of target function
+        """
+        if self._f is None:
+            return self._increment(x, y, 0.0)
+        try:
+            return self._f(x, y)
+        except TypeError:
+            # Target function accepts only scalars
+            return np.vectorize(self._f)(x, y)
+
+    def get_dense_output(self):
+        """
+        Get dense output of last computation.
+        Values of target function stored by compute are used, so target function is not evaluated again
+        (without them it is evaluated once per point)
+
+        :return: callable, which interpolates approximation inside of grid
+        """
+        if self._y is not None:
+            dydx = self._dydx if self._dydx is not None else self.slope(self._x, self._y)
+            return DenseOutput(self._x, self._y, dydx)
+        raise ValueError("You must compute values first!")
+
+    def compute_dense(self, x0: float, y0: float, x: float, n: int, threshold: Optional[float] = None,
+                      event: Optional[Callable[[float, float], float]] = None, dtype: type = np.float64,
+                      should_stop: Optional[Callable[[], bool]] = None):
+        """
+        Compute approximation, lte, gte (see compute) and dense output of approximation
+
+        :return: array of x, array of corresponding y, array of corresponding lte, array of corresponding gte,
+                 dense output
+        """
+        return (*self.compute(x0, y0, x, n, threshold, event, dtype, should_stop), self.get_dense_output())
+
+    def get_event_x(self):
+        """
+        Get x, where last computation was stopped by event
+
+        :return: x of event or None if whole interval was computed
+        """
+        return self._event_x
+
+    def get_reference(self):
+        """
+        Get Richardson extrapolation of last computation, which is used as reference without analytical solution
+
+        :return: array of x, array of corresponding reference y
+        """
+        if self._reference is not None:
+            return self._x, self._reference
+        raise ValueError("You must compute values without analytical solution first!")
+
     def get_max_abs_gte(self):
         """
         Get max gte by absolute value
@@ -90,23 +462,146 @@ class NumericalMethod:
             return np.amax(np.absolute(self._gte))
         raise ValueError("You must compute values first!")
 
-    def get_gte_dependency(self, x0: float, y0: float, x: float, from_: int, to_: int):
+    def find_n_for_tolerance(self, x0: float, y0: float, x: float, tolerance: float, max_n: int,
+                             threshold: Optional[float] = None, dtype: type = np.float64):
+        """
+        Find minimal N, for which max absolute gte does not exceed tolerance.
+        Max gte is assumed to decrease with N (doubling, then bisection)
+
+        :param x0: start point (x component)
+        :param y0: start point (y component)
+        :param x: end point (x component)
+        :param tolerance: max allowed absolute gte
+        :param max_n: max allowed N
+        :param threshold: max allowed absolute value of y
+        :param dtype: precision of computation (float32, float64, longdouble)
+        :return: N, its max absolute gte
+        """
+        def fits(n: int):
+            self.compute(x0, y0, x, n, threshold, None, dtype)
+            return self._event_x is None and self.get_max_abs_gte() <= tolerance
+
+        high = 1
+        while not fits(high):
+            if high >= max_n:
+                raise ValueError("Tolerance can not be reached!", {"n": "n"})
+            high = min(2 * high, max_n)
+
+        low = high // 2
+        while high - low > 1:
+            middle = (low + high) // 2
+            if fits(middle):
+                high = middle
+            else:
+                low = middle
+
+        self.compute(x0, y0, x, high, threshold, None, dtype)
+        return high, self.get_max_abs_gte()
+
+    def get_gte_dependency(self, x0: float, y0: float, x: float, from_: int, to_: int,
+                           threshold: Optional[float] = None,
+                           event: Optional[Callable[[float, float], float]] = None, dtype: type = np.float64,
+                           checkpoint: Optional[str] = None, checkpoint_interval: float = 10.0,
+                           resume: bool = False):
         """
-        Get dependency of max absolute gta from N
+        Get dependency of max absolute gta from N.
+        If computation for some N is stopped by event, its max gte is NaN.
+        Computed N are periodically saved to checkpoint, resumed computation skips them
 
         :param x0: start point (x component)
         :param y0: start point (y component)
         :param x: end point (x component)
         :param from_: start of interval
         :param to_: end of interval
+        :param threshold: max allowed absolute value of y
+        :param event: event function from R^2 -> R
+        :param dtype: precision of computation (float32, float64, longdouble)
+        :param checkpoint: path of checkpoint (.npz or .cols)
+        :param checkpoint_interval: min time between checkpoints in seconds
+        :param resume: continue computation from checkpoint
         :return: interval as array, corresponding array of max gte
         """
-        self._gte_d = np.empty(to_ - from_ + 1)
-        self._ns = np.empty(to_ - from_ + 1)
+        self._gte_d = np.empty(to_ - from_ + 1, dtype=dtype)
+        self._ns = np.arange(from_, to_ + 1, dtype=float)
+        done = np.zeros(to_ - from_ + 1, dtype=bool)
+
+        definition_hash = None
+        if checkpoint is not None:
+            definition_hash = self.get_definition_hash(
+                "gte_dependency", float(x0), float(y0), float(x), from_, to_, threshold, event, np.dtype(dtype).str
+            )
+            state = load_checkpoint(checkpoint, definition_hash) if resume else None
+            if state is not None:
+                self._gte_d[:] = state["gte_d"]
+                done[:] = state["done"]
+        last_checkpoint = time.monotonic()
 
         for n in range(from_, to_ + 1):
-            self.compute(x0, y0, x, n)
-            self._ns[n - from_] = n
-            self._gte_d[n - from_] = self.get_max_abs_gte()
+            if done[n - from_]:
+                continue
+            self.compute(x0, y0, x, n, threshold, event, dtype)
+            self._gte_d[n - from_] = self.get_max_abs_gte() if self._event_x is None else np.nan
+            done[n - from_] = True
+
+            if checkpoint is not None and time.monotonic() - last_checkpoint >= checkpoint_interval:
+                save_checkpoint(checkpoint, {"gte_d": self._gte_d, "done": done}, definition_hash)
+                last_checkpoint = time.monotonic()
+
+        if checkpoint is not None:
+            save_checkpoint(checkpoint, {"gte_d": self._gte_d, "done": done}, definition_hash)
+
+        return self._ns, self._gte_d
+
+    def get_gte_dependency_lockstep(self, x0: float, y0: float, x: float, from_: int, to_: int,
+                                    threshold: Optional[float] = None, dtype: type = np.float64):
+        """
+        Get dependency of max absolute gte from N, all N are computed simultaneously.
+        Every N has its own row with its own step, rows are finished when they reach x,
+        so sweep takes to_ vectorized steps instead of from_ + ... + to_ scalar steps.
+        If computation for some N blows up or exceeds threshold, its max gte is NaN.
+        Without analytical solution every row is also advanced by half steps and gte is estimated by step doubling
+
+        :param x0: start point (x component)
+        :param y0: start point (y component)
+        :param x: end point (x component)
+        :param from_: start of interval
+        :param to_: end of interval
+        :param threshold: max allowed absolute value of y
+        :param dtype: precision of computation (float32, float64, longdouble)
+        :return: interval as array, corresponding array of max gte
+        """
+        scalar = np.dtype(dtype).type
+        constant_solution = self._get_constant_solution(x0, y0) if self._solution is not None else None
+        self._ns = np.arange(from_, to_ + 1, dtype=float)
+        h = (scalar(x) - scalar(x0)) / self._ns.astype(dtype)
+        x_ = np.full(len(self._ns), x0, dtype=dtype)
+        y_ = np.full(len(self._ns), y0, dtype=dtype)
+        fine = np.full(len(self._ns), y0, dtype=dtype)
+        factor = self._get_richardson_factor()
+        self._gte_d = np.zeros(len(self._ns), dtype=dtype)
+
+        with np.errstate(all="ignore"):
+            for i in range(1, to_ + 1):
+                # N are sorted, so rows, which are not finished, are suffix
+                active = slice(max(i - from_, 0), None)
+                if constant_solution is None:
+                    half_steps = h[active] / 2
+                    middle = fine[active] + half_steps * self._increment(x_[active], fine[active], half_steps)
+                    fine[active] = middle + half_steps * self._increment(x_[active] + half_steps, middle, half_steps)
+                y_[active] += h[active] * self._increment(x_[active], y_[active], h[active])
+                x_[active] += h[active]
+
+                # Stopped row stays NaN, so its max gte is NaN
+                stopped = ~np.isfinite(y_[active])
+                if threshold is not None:
+                    stopped |= np.absolute(y_[active]) > threshold
+                y_[active][stopped] = np.nan
+                if constant_solution is not None:
+                    gte = constant_solution(x_[active]) - y_[active]
+                else:
+                    gte = (fine[active] - y_[active]) * factor
+                self._gte_d[active] = np.maximum(self._gte_d[active], np.absolute(gte))
+                if np.all(np.isnan(self._gte_d[active])):
+                    break
 
         return self._ns, self._gte_d
@@ -1,21 +1,21 @@
-from typing import Callable
+from typing import Callable, Optional
 from application.methods.numerical_method import NumericalMethod
 
 
 class RungeKuttaMethod(NumericalMethod):
-    def __init__(self, f: Callable[[float, float], float], solution: Callable[[float], float]):
+    ORDER = 4
+
+    def __init__(self, f: Callable[[float, float], float], solution: Optional[Callable[[float], float]]):
         """
         Init Runge-Kutta method
 
         :param f: target method
-        :param solution: analytical solution
+        :param solution: analytical solution or None
         """
-        super().__init__(
-            lambda x, y, h: (
-                                    f(x, y) +
-                                    2 * f(x + h / 2, y + h * f(x, y) / 2) +
-                                    2 * f(x + h / 2, y + h * f(x + h / 2, y + h * f(x, y) / 2) / 2) +
-                                    f(x + h, y + h * f(x + h / 2, y + h * f(x + h / 2, y + h * f(x, y) / 2) / 2))
-                            ) / 6,
-            solution
-        )
+        def increment(x: float, y: float, h: float, k1: float):
+            k2 = f(x + h / 2, y + h * k1 / 2)
+            k3 = f(x + h / 2, y + h * k2 / 2)
+            k4 = f(x + h, y + h * k3)
+            return (k1 + 2 * k2 + 2 * k3 + k4) / 6
+
+        super().__init__(lambda x, y, h: increment(x, y, h, f(x, y)), solution, f, increment)
@@ -1,4 +1,8 @@
-from typing import Callable
+import copy
+import os
+import numpy as np
+from concurrent.futures import Executor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from application.gui.mpl_canvas import MplCanvas
 from application.gui.qui_configurator import GuiConfigurator
@@ -6,134 +10,262 @@ from application.methods.euler_method import EulerMethod
 from application.methods.improved_euler_method import ImprovedEulerMethod
 from application.methods.runge_kutta_method import RungeKuttaMethod
 from application.methods.numerical_method import NumericalMethod
+from application.methods.dense_output import DenseOutput
+from application.ensemble_runner import EnsembleRunner
+from application.interval import check_x_x0
+from application.slope_field import SlopeField
+from application import results_io
+from application.replot import DASHBOARD, FAMILY
+from application.report import render_report
+from application.parallel import create_process_executor, create_thread_executor, submit_method
+
+
+# Number of points per unit, where dense output is evaluated without analytical solution
+DENSE_OUTPUT_DPX = 200
 
 
 class Midleware:
-    def __init__(self, f: Callable[[float, float], float], solution: Callable[[float], float]):
+    def __init__(self, f: Callable[[float, float], float], solution: Optional[Callable[[float], float]],
+                 executor: Optional[Executor] = None):
         """
         Init Midleware, which connects UI and methods
 
         :param f: target function
-        :param solution: analytical solution
+        :param solution: analytical solution or None (lte and gte are estimated by step doubling)
+        :param executor: executor for solving methods simultaneously (thread pool by default)
         """
+        self._slope_field = SlopeField(f)
         self._e_m = EulerMethod(f, solution)
         self._i_e_m = ImprovedEulerMethod(f, solution)
         self._rk_m = RungeKuttaMethod(f, solution)
+        self._methods: Dict[str, NumericalMethod] = dict()
+        self._styles: Dict[str, dict] = dict()
+        self._executor = executor if executor is not None else create_thread_executor()
+        self._process_pool = False
+        self._max_workers: Optional[int] = None
 
-    @staticmethod
-    def __append_default_kwargs(kwargs: dict, method: NumericalMethod, x0: float, y0: float, x: float, n: int,
-                                graph_type: str, show: bool, label: str, color: str):
-        """
-        Add computed graph to kwargs
-        """
-        if show:
-            x_, y_, lte, gte = method.compute(x0, y0, x, n)
-            kwargs[type(method).__name__] = {
-                "x": x_,
-                "y": y_ if graph_type == GuiConfigurator.GRAPH else lte if graph_type == GuiConfigurator.LTE else gte,
-                "label": label,
-                "color": color
-            }
+        self.register_method(type(self._e_m).__name__, self._e_m)
+        self.register_method(type(self._i_e_m).__name__, self._i_e_m)
+        self.register_method(type(self._rk_m).__name__, self._rk_m)
 
-    @staticmethod
-    def __append_gte_d_kwargs(kwargs: dict, method: NumericalMethod, x0: float, y0: float, x: float,
-                              from_: int, to_: int, show: bool, label: str, color: str):
+    def register_method(self, name: str, method: NumericalMethod, label: str = None, color: str = None):
         """
-        Add computed graph to kwargs. Graph is GTE dependency
+        Register numerical method, so it can be selected in plot_graphs and plot_gte_dependency
+
+        :param name: unique name of method
+        :param method: numerical method
+        :param label: default label of graph
+        :param color: default color of graph
+        :return:
         """
-        if show:
-            ns_, gte_d_ = method.get_gte_dependency(x0, y0, x, from_, to_)
-            kwargs[type(method).__name__] = {
-                "x": ns_,
-                "y": gte_d_,
-                "label": label,
-                "color": color
-            }
+        if name in self._methods:
+            raise ValueError(f"Method {name} is already registered!")
+        self._methods[name] = method
+        self._styles[name] = {"label": label if label is not None else name, "color": color}
 
-    @staticmethod
-    def __check_validity_of_interval(x0: float, x: float):
+        # Forked workers do not see new method, so pool is recreated
+        if self._process_pool:
+            self.use_process_pool(self._max_workers)
+
+    def get_slope_field(self):
         """
-        Check if x0 smaller then x
+        Get slope field of target function
 
-        :param x0: float
-        :param x: float
-        :return: bool
+        :return: SlopeField
         """
-        return x0 < x
+        return self._slope_field
 
-    @staticmethod
-    def __check_interval_for_zero_holding(x0: float, x: float):
+    def use_process_pool(self, max_workers: Optional[int] = None):
         """
-        Check if x or x0 to small by absolute value.
-        Assumation: (x0, x) - valid interval
+        Replace current executor with process pool.
+        Pool is recreated when new method is registered, so workers see all methods
 
-        :param x0:
-        :param x:
+        :param max_workers: number of processes
         :return:
         """
-        return x0 > GuiConfigurator.EPSILON or x < -GuiConfigurator.EPSILON
+        self.shutdown()
+        self._executor = create_process_executor(self._methods, max_workers)
+        self._process_pool = True
+        self._max_workers = max_workers
 
-    @staticmethod
-    def __check_distance(x0: float, x: float):
+    def solve_ensemble(self, name: str, x0: float, y0: np.ndarray, x: float, n: int,
+                       workers: Optional[int] = None, chunk_size: Optional[int] = None,
+                       threshold: Optional[float] = None, dtype: type = np.float64,
+                       checkpoint: Optional[str] = None, resume: bool = False):
         """
-        Check distanse between x and x0
+        Solve ensemble of initial values by registered method in worker processes.
+        Computed initial values are saved to checkpoint, resumed run skips them
 
-        :param x0: float
-        :param x: float
-        :return: bool
+        :param name: name of registered method
+        :param x0: start point (x component)
+        :param y0: array of start points (y component)
+        :param x: end point (x component)
+        :param n: number of intervals
+        :param workers: number of processes (number of CPUs by default)
+        :param chunk_size: number of initial values, which worker takes at once
+        :param threshold: max allowed absolute value of y
+        :param dtype: precision of computation (float32, float64, longdouble)
+        :param checkpoint: path of checkpoint (.npz or .cols)
+        :param resume: continue computation from checkpoint
+        :return: array of x, arrays of y and gte of shape (len(y0), n + 1)
         """
-        return x - x0 > GuiConfigurator.MINIMAL_DISTANCE_BETWEEN_X_X0
+        check_x_x0(x0, x)
 
-    def __check_x_x0(self, x0: float, x: float):
+        if n <= 0:
+            raise ValueError("N must be positive!", {"n": "n"})
+
+        if name not in self._methods:
+            raise ValueError(f"Unknown method {name}!")
+
+        return EnsembleRunner(self._methods[name], workers, chunk_size).run(
+            x0, y0, x, n, threshold, dtype, checkpoint, resume=resume
+        )
+
+    def shutdown(self):
         """
-        Check x and x0 before ploting.
-        Raise excaption if they are bad.
+        Shutdown executor
 
-        :param x0: float
-        :param x: float
         :return:
         """
-        if not self.__check_validity_of_interval(x0, x):
-            raise ValueError("X0 must be less then x!", {"x0": "x0", "x": "x"})
+        self._executor.shutdown()
 
-        if not self.__check_interval_for_zero_holding(x0, x):
-            raise ValueError("Interval should not contain too small values", {"x0": "x0", "x": "x"})
+    def __select_methods(self, show_euler: bool, euler_label: str, euler_color: str,
+                         show_improved_euler: bool, improved_euler_label: str, improved_euler_color: str,
+                         show_runge_kutta: bool, runge_kutta_label: str, runge_kutta_color: str,
+                         methods: Iterable[str]) -> List[Tuple[str, str, str]]:
+        """
+        Collect selected methods in fixed order: Euler, Improved Euler, Runge-Kutta, then registered ones
 
-        if not self.__check_distance(x0, x):
-            raise ValueError("X0 and x are too close!", {"x0": "x0", "x": "x"})
+        :return: list of (name, label, color)
+        """
+        selected = []
+        if show_euler:
+            selected.append((type(self._e_m).__name__, euler_label, euler_color))
+        if show_improved_euler:
+            selected.append((type(self._i_e_m).__name__, improved_euler_label, improved_euler_color))
+        if show_runge_kutta:
+            selected.append((type(self._rk_m).__name__, runge_kutta_label, runge_kutta_color))
+        for name in methods:
+            if name not in self._methods:
+                raise ValueError(f"Unknown method {name}!")
+            selected.append((name, self._styles[name]["label"], self._styles[name]["color"]))
+        return selected
 
-    def plot_graphs(self, sc: MplCanvas, x0: float, y0: float, x: float, n: int,
-                    title: str = None, xlabel: str = None, ylabel: str = None,
-                    exact_label: str = None, exact_color: str = None,
-                    euler_label: str = None, euler_color: str = None,
-                    improved_euler_label: str = None, improved_euler_color: str = None,
-                    runge_kutta_label: str = None, runge_kutta_color: str = None,
-                    graph_type: str = None,
-                    show_euler: bool = False, show_improved_euler: bool = False, show_runge_kutta: bool = False):
+    def __solve(self, selected: List[Tuple[str, str, str]], attr: str, *args,
+                should_stop: Optional[Callable[[], bool]] = None) -> list:
+        """
+        Solve all selected methods simultaneously.
+        Cancellable solve runs in calling thread on copies of methods, so it shares neither methods nor workers
+        with other solves and stops as soon as should_stop returns True
+
+        :param selected: list of (name, label, color)
+        :param attr: name of called attribute (compute, get_gte_dependency)
+        :param should_stop: function without arguments, which tells whether solve is not needed anymore
+        :return: results in order of selected
+        """
+        if should_stop is not None:
+            return [getattr(copy.copy(self._methods[name]), attr)(*args, should_stop=should_stop)
+                    for name, _, _ in selected]
+        futures = [submit_method(self._executor, name, self._methods[name], attr, *args) for name, _, _ in selected]
+        return [future.result() for future in futures]
+
+    def compute_graphs(self, x0: float, y0: float, x: float, n: int,
+                       exact_label: str = None, exact_color: str = None,
+                       euler_label: str = None, euler_color: str = None,
+                       improved_euler_label: str = None, improved_euler_color: str = None,
+                       runge_kutta_label: str = None, runge_kutta_color: str = None,
+                       graph_type: str = None,
+                       show_euler: bool = False, show_improved_euler: bool = False, show_runge_kutta: bool = False,
+                       methods: Iterable[str] = (), threshold: Optional[float] = None, dense_output: bool = False,
+                       dtype: type = np.float64, should_stop: Optional[Callable[[], bool]] = None):
         """
-        Plot approximation, lte, gte
+        Compute approximation, lte, gte graphs without plotting, so it can be done outside of GUI thread.
+        All selected methods are solved simultaneously, graphs are merged in fixed order.
+        Graphs are truncated where solution blows up or exceeds threshold.
+        With dense output approximation and gte are interpolated at points of exact solution
+        (without analytical solution approximation is interpolated at uniform points).
+        Without analytical solution exact graph is skipped, lte and gte are estimated by step doubling.
+        Dtype sets precision of computation (float32, float64, longdouble).
+        Dashboard graph type returns approximation, lte and gte of one solve, graph info contains index of panel.
+        With should_stop methods are solved in calling thread and solve is cancelled with ValueError,
+        when should_stop returns True
         """
-        self.__check_x_x0(x0, x)
+        check_x_x0(x0, x)
 
         if n == 0:
             raise ValueError("N must be positive!", {"n": "n"})
 
-        if graph_type != GuiConfigurator.GRAPH and not show_euler and not show_improved_euler and not show_runge_kutta:
+        selected = self.__select_methods(show_euler, euler_label, euler_color,
+                                         show_improved_euler, improved_euler_label, improved_euler_color,
+                                         show_runge_kutta, runge_kutta_label, runge_kutta_color, methods)
+        if graph_type != GuiConfigurator.GRAPH and not selected:
             raise ValueError("You must choose method!")
 
         kwargs = dict()
-        self.__append_default_kwargs(kwargs, self._e_m, x0, y0, x, n, graph_type,
-                                     show_euler, euler_label, euler_color)
-        self.__append_default_kwargs(kwargs, self._i_e_m, x0, y0, x, n, graph_type,
-                                     show_improved_euler, improved_euler_label, improved_euler_color)
-        self.__append_default_kwargs(kwargs, self._rk_m, x0, y0, x, n, graph_type,
-                                     show_runge_kutta, runge_kutta_label, runge_kutta_color)
+        dense_output = dense_output and graph_type != GuiConfigurator.LTE
+        results = self.__solve(selected, "compute_dense" if dense_output else "compute",
+                               x0, y0, x, n, threshold, None, dtype, should_stop=should_stop)
+        exact_x, exact_y = self._e_m.solution(x0, y0, x) if self._e_m.has_solution() else (None, None)
+        # Without analytical solution dense output is evaluated at uniform points, gte stays at grid
+        points = exact_x if exact_x is not None else np.linspace(x0, x, int((x - x0) * DENSE_OUTPUT_DPX))
+        for (name, label, color), result in zip(selected, results):
+            x_, y_, lte, gte = result[:4]
+            grid_x = gte_x = x_
+            if dense_output:
+                dense: DenseOutput = result[4]
+                inside = points <= x_[-1]
+                x_, y_ = points[inside], dense(points[inside])
+                if exact_x is not None:
+                    gte_x, gte = x_, exact_y[inside] - y_
+            if graph_type == GuiConfigurator.DASHBOARD:
+                kwargs[name] = {"x": x_, "y": y_, "label": label, "color": color, "panel": 0}
+                kwargs[name + ":" + GuiConfigurator.LTE] = {"x": grid_x, "y": lte, "label": label, "color": color,
+                                                           "panel": 1}
+                kwargs[name + ":" + GuiConfigurator.GTE] = {"x": gte_x, "y": gte, "label": label, "color": color,
+                                                           "panel": 2}
+                continue
+            kwargs[name] = {
+                "x": gte_x if graph_type == GuiConfigurator.GTE else x_,
+                "y": y_ if graph_type == GuiConfigurator.GRAPH else lte if graph_type == GuiConfigurator.LTE else gte,
+                "label": label,
+                "color": color
+            }
 
+        if exact_x is None:
+            return kwargs
         if graph_type == GuiConfigurator.GRAPH:
-            exact_x, exact_y = self._e_m.solution(x0, y0, x)
             kwargs["exact"] = {"x": exact_x, "y": exact_y, "label": exact_label, "color": exact_color}
+        elif graph_type == GuiConfigurator.DASHBOARD:
+            kwargs["exact"] = {"x": exact_x, "y": exact_y, "label": exact_label, "color": exact_color, "panel": 0}
+
+        return kwargs
+
+    def plot_graphs(self, sc: MplCanvas, x0: float, y0: float, x: float, n: int,
+                    title: str = None, xlabel: str = None, ylabel: str = None, graph_type: str = None,
+                    slope_field: bool = False, **options):
+        """
+        Plot approximation, lte, gte. Dashboard graph type plots all of them on linked panels from one solve
+
+        :param slope_field: draw slope field under approximation
+        :param options: labels, colors and options of compute_graphs
+        """
+        kwargs = self.compute_graphs(x0, y0, x, n, graph_type=graph_type, **options)
+        slope_field = self._slope_field if slope_field and graph_type in (GuiConfigurator.GRAPH,
+                                                                          GuiConfigurator.DASHBOARD) else None
+        if graph_type == GuiConfigurator.DASHBOARD:
+            sc.plot_dashboard(title, xlabel, self.get_dashboard_ylabels(ylabel), slope_field=slope_field, **kwargs)
+        else:
+            sc.plot(title + " | " + graph_type, xlabel, ylabel, slope_field=slope_field, **kwargs)
 
-        sc.plot(title + " | " + graph_type, xlabel, ylabel, **kwargs)
+    @staticmethod
+    def get_dashboard_ylabels(ylabel: str):
+        """
+        Get y axis names of dashboard panels: approximation, lte, gte
+
+        :param ylabel: y axis name of approximation
+        :return: list of names
+        """
+        return [ylabel, GuiConfigurator.LTE, GuiConfigurator.GTE]
 
     def plot_gte_dependency(self, sc: MplCanvas, x0: float, y0: float, x: float, from_: int, to_: int,
                             title: str = None, xlabel: str = None, ylabel: str = None,
@@ -141,24 +273,140 @@ class Midleware:
                             improved_euler_label: str = None, improved_euler_color: str = None,
                             runge_kutta_label: str = None, runge_kutta_color: str = None,
                             show_euler: bool = False, show_improved_euler: bool = False,
-                            show_runge_kutta: bool = False):
+                            show_runge_kutta: bool = False, methods: Iterable[str] = (),
+                            threshold: Optional[float] = None, dtype: type = np.float64,
+                            checkpoint_dir: Optional[str] = None, resume: bool = False, lockstep: bool = False):
         """
-        Plot gte dependency from N
+        Plot gte dependency from N.
+        All selected methods are solved simultaneously, graphs are merged in fixed order.
+        N, for which solution blows up or exceeds threshold, are skipped.
+        Dtype sets precision of computation (float32, float64, longdouble).
+        If checkpoint_dir is set, sweep of every method is saved to checkpoint_dir/<method name>.npz,
+        resumed sweep skips computed N.
+        In lockstep mode all N of every method are computed simultaneously (checkpoints are not used)
         """
-        self.__check_x_x0(x0, x)
+        check_x_x0(x0, x)
 
         if from_ >= to_:
             raise ValueError("From must be less then to!", {"from": "from", "to": "to"})
 
-        if not show_euler and not show_improved_euler and not show_runge_kutta:
+        selected = self.__select_methods(show_euler, euler_label, euler_color,
+                                         show_improved_euler, improved_euler_label, improved_euler_color,
+                                         show_runge_kutta, runge_kutta_label, runge_kutta_color, methods)
+        if not selected:
             raise ValueError("You must choose method!")
 
         kwargs = dict()
-        self.__append_gte_d_kwargs(kwargs, self._e_m, x0, y0, x, from_, to_,
-                                   show_euler, euler_label, euler_color)
-        self.__append_gte_d_kwargs(kwargs, self._i_e_m, x0, y0, x, from_, to_,
-                                   show_improved_euler, improved_euler_label, improved_euler_color)
-        self.__append_gte_d_kwargs(kwargs, self._rk_m, x0, y0, x, from_, to_,
-                                   show_runge_kutta, runge_kutta_label, runge_kutta_color)
+        if lockstep:
+            results = self.__solve(selected, "get_gte_dependency_lockstep", x0, y0, x, from_, to_, threshold, dtype)
+        elif checkpoint_dir is None:
+            results = self.__solve(selected, "get_gte_dependency", x0, y0, x, from_, to_, threshold, None, dtype)
+        else:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+            futures = [
+                submit_method(self._executor, name, self._methods[name], "get_gte_dependency",
+                              x0, y0, x, from_, to_, threshold, None, dtype,
+                              checkpoint=os.path.join(checkpoint_dir, name + results_io.NPZ_EXTENSION), resume=resume)
+                for name, _, _ in selected
+            ]
+            results = [future.result() for future in futures]
+        for (name, label, color), (ns_, gte_d_) in zip(selected, results):
+            kwargs[name] = {
+                "x": ns_,
+                "y": gte_d_,
+                "label": label,
+                "color": color
+            }
 
         sc.plot(title, xlabel, ylabel, **kwargs)
+
+    def compute_family(self, x0: float, y0: np.ndarray, x: float, n: int,
+                       exact_label: str = None, exact_color: str = None,
+                       euler_label: str = None, euler_color: str = None,
+                       improved_euler_label: str = None, improved_euler_color: str = None,
+                       runge_kutta_label: str = None, runge_kutta_color: str = None,
+                       show_euler: bool = False, show_improved_euler: bool = False, show_runge_kutta: bool = False,
+                       methods: Iterable[str] = (), threshold: Optional[float] = None, dtype: type = np.float64):
+        """
+        Compute approximations and exact solutions for array of initial values.
+        Every selected method solves all initial values in one batched pass.
+        Without analytical solution exact solutions are skipped
+
+        :return: graphs, "y" of every graph has shape (len(y0), len(x))
+        """
+        check_x_x0(x0, x)
+
+        if n <= 0:
+            raise ValueError("N must be positive!", {"n": "n"})
+
+        y0 = np.asarray(y0, dtype=float)
+        if len(y0) == 0:
+            raise ValueError("Family must contain initial values!", {"y0": "y0"})
+
+        selected = self.__select_methods(show_euler, euler_label, euler_color,
+                                         show_improved_euler, improved_euler_label, improved_euler_color,
+                                         show_runge_kutta, runge_kutta_label, runge_kutta_color, methods)
+
+        kwargs = dict()
+        if self._e_m.has_solution():
+            exact_x, exact_y = self._e_m.solution_family(x0, y0, x)
+        elif not selected:
+            raise ValueError("You must choose method!")
+        results = self.__solve(selected, "compute_ensemble", x0, y0, x, n, threshold, dtype)
+        for (name, label, color), (x_, y_, lte, gte) in zip(selected, results):
+            kwargs[name] = {"x": x_, "y": y_, "label": label, "color": color}
+        if self._e_m.has_solution():
+            kwargs["exact"] = {"x": exact_x, "y": exact_y, "label": exact_label, "color": exact_color}
+
+        return kwargs
+
+    def plot_family(self, sc: MplCanvas, x0: float, y0: np.ndarray, x: float, n: int,
+                    title: str = None, xlabel: str = None, ylabel: str = None, **options):
+        """
+        Plot approximations and exact solutions for array of initial values
+
+        :param options: labels, colors and options of compute_family
+        """
+        kwargs = self.compute_family(x0, y0, x, n, **options)
+        sc.plot_family(title, xlabel, ylabel, **kwargs)
+
+    def render_report(self, specs: Iterable[dict], workers: Optional[int] = None):
+        """
+        Render figures offscreen in process pool, methods are selected by registered names
+
+        :param specs: figure specs (see report.render_report)
+        :param workers: number of processes (number of CPUs by default)
+        :return: paths of images in order of specs
+        """
+        return render_report(self._methods, specs, self._styles, workers)
+
+    @staticmethod
+    def save_plot(sc: MplCanvas, path: str):
+        """
+        Save last plotted graphs to .npz or .cols file
+
+        :param sc: canvas
+        :param path: path of file
+        :return:
+        """
+        last_plot = sc.get_last_plot()
+        if last_plot is None:
+            raise ValueError("Nothing to save!")
+        results_io.save_plot(path, *last_plot)
+
+    @staticmethod
+    def load_plot(sc: MplCanvas, path: str):
+        """
+        Plot graphs from .npz or .cols file without computation
+
+        :param sc: canvas
+        :param path: path of file
+        :return:
+        """
+        kind, title, xlabel, ylabel, graphs = results_io.load_plot(path)
+        if kind == FAMILY:
+            sc.plot_family(title, xlabel, ylabel, **graphs)
+        elif kind == DASHBOARD:
+            sc.plot_dashboard(title, xlabel, ylabel, **graphs)
+        else:
+            sc.plot(title, xlabel, ylabel, **graphs)
@@ -0,0 +1,86 @@
+import multiprocessing
+import sys
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional
+from application.methods.numerical_method import NumericalMethod
+
+
+# Methods available inside worker processes. Filled by worker initializer
+_worker_methods: Dict[str, NumericalMethod] = dict()
+
+
+def _init_worker(methods: Dict[str, NumericalMethod]):
+    """
+    Init worker process
+
+    :param methods: registry of methods (name -> method)
+    :return:
+    """
+    global _worker_methods
+    _worker_methods = methods
+
+
+def _call_worker_method(name: str, attr: str, args: tuple, kwargs: dict):
+    """
+    Call method from worker registry
+
+    :param name: name of method in registry
+    :param attr: name of called attribute (compute, get_gte_dependency...)
+    :param args: positional arguments
+    :param kwargs: keyword arguments
+    :return: result of call
+    """
+    return getattr(_worker_methods[name], attr)(*args, **kwargs)
+
+
+def can_fork():
+    """
+    Check whether process pool can be used: workers must be forked.
+    Forking of running Cocoa application on macOS is unsafe, so threads are used there
+
+    :return: bool
+    """
+    return "fork" in multiprocessing.get_all_start_methods() and sys.platform != "darwin"
+
+
+def create_thread_executor(max_workers: Optional[int] = None):
+    """
+    Create thread pool executor
+
+    :param max_workers: number of threads
+    :return: ThreadPoolExecutor
+    """
+    return ThreadPoolExecutor(max_workers)
+
+
+def create_process_executor(methods: Dict[str, NumericalMethod], max_workers: Optional[int] = None):
+    """
+    Create process pool executor.
+    Workers are forked, so they inherit methods and target functions do not have to be picklable.
+    Methods must be registered before the first submit
+
+    :param methods: registry of methods (name -> method)
+    :param max_workers: number of processes
+    :return: ProcessPoolExecutor
+    """
+    return ProcessPoolExecutor(
+        max_workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_worker,
+        initargs=(methods,)
+    )
+
+
+def submit_method(executor: Executor, name: str, method: NumericalMethod, attr: str, *args, **kwargs) -> Future:
+    """
+    Submit call of method attribute to executor
+
+    :param executor: thread or process pool
+    :param name: name of method in registry
+    :param method: method itself
+    :param attr: name of called attribute (compute, get_gte_dependency...)
+    :return: Future
+    """
+    if isinstance(executor, ProcessPoolExecutor):
+        return executor.submit(_call_worker_method, name, attr, args, kwargs)
+    return executor.submit(getattr(method, attr), *args, **kwargs)
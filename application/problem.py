@@ -0,0 +1,22 @@
+from math import e
+
+
+def f(x: float, y: float):
+    """
+    Target function of y' = f(x, y)
+
+    :param x: x component
+    :param y: y component
+    :return: derivative
+    """
+    return (3 * y + 2 * x * y) / x ** 2
+
+
+def solution(x: float):
+    """
+    Analytical solution of y' = f(x, y) up to constant
+
+    :param x: x component
+    :return: value of solution
+    """
+    return e ** (- 3 / x) * x ** 2
@@ -0,0 +1,101 @@
+import numpy as np
+from typing import Dict, List, Optional
+from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from application import results_io
+
+
+# Kinds of plot
+PLOT = "plot"
+FAMILY = "family"
+DASHBOARD = "dashboard"
+# Width of curves of family
+FAMILY_LINE_WIDTH = 0.8
+
+
+def draw_plot(ax: Axes, kind: str, title: str, xlabel: str, ylabel: str, graphs: Dict[str, dict]):
+    """
+    Draw graphs on axes
+
+    :param ax: target axes
+    :param kind: kind of plot ("plot" or "family")
+    :param title: title of plot
+    :param xlabel: x axis name
+    :param ylabel: y axis name
+    :param graphs: graphs info: [name: {"x": values, "y": values, "color": color, "label": label}]
+    :return:
+    """
+    ax.grid()
+    ax.set(xlabel=xlabel, ylabel=ylabel, title=title)
+    for name, graph_info in graphs.items():
+        if kind == FAMILY:
+            y = np.asarray(graph_info["y"], dtype=float)
+            x = np.broadcast_to(np.asarray(graph_info["x"], dtype=float), y.shape)
+            ax.add_collection(LineCollection(
+                np.stack([x, y], axis=-1),
+                colors=graph_info.get("color", None),
+                label=graph_info.get("label", None),
+                linewidths=FAMILY_LINE_WIDTH
+            ))
+        else:
+            ax.plot(graph_info["x"], graph_info["y"], color=graph_info.get("color", None),
+                    label=graph_info.get("label", None))
+
+    ax.autoscale_view()
+    ax.legend()
+
+
+def draw_dashboard(axes: List[Axes], title: str, xlabel: str, ylabels: List[str], graphs: Dict[str, dict]):
+    """
+    Draw graphs on linked axes, which share x axis. Graph is drawn on axes with index "panel"
+
+    :param axes: target axes from top to bottom
+    :param title: title of top axes
+    :param xlabel: x axis name of bottom axes
+    :param ylabels: y axis names of axes
+    :param graphs: graphs info: [name: {"x": values, "y": values, "color": color, "label": label, "panel": index}]
+    :return:
+    """
+    for i, (ax, ylabel) in enumerate(zip(axes, ylabels)):
+        draw_plot(ax, PLOT, title if i == 0 else None, xlabel if i == len(axes) - 1 else None, ylabel,
+                  {name: graph_info for name, graph_info in graphs.items() if graph_info.get("panel", 0) == i})
+
+
+def create_dashboard_axes(figure: Figure, panels: int):
+    """
+    Create axes of dashboard, which share x axis
+
+    :param figure: target figure
+    :param panels: number of axes
+    :return: axes from top to bottom
+    """
+    return list(figure.subplots(panels, 1, sharex=True, squeeze=False)[:, 0])
+
+
+def replot(path: str, output: Optional[str] = None):
+    """
+    Plot graphs from .npz or .cols file without computation
+
+    :param path: path of file with results
+    :param output: path of image (format by extension), window is shown if it is not given
+    :return:
+    """
+    kind, title, xlabel, ylabel, graphs = results_io.load_plot(path)
+    if output is not None:
+        figure = Figure()
+        FigureCanvasAgg(figure)
+    else:
+        import matplotlib.pyplot as plt
+        figure = plt.figure()
+
+    if kind == DASHBOARD:
+        draw_dashboard(create_dashboard_axes(figure, len(ylabel)), title, xlabel, ylabel, graphs)
+    else:
+        draw_plot(figure.add_subplot(), kind, title, xlabel, ylabel, graphs)
+
+    if output is not None:
+        figure.savefig(output)
+    else:
+        plt.show()
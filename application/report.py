@@ -0,0 +1,187 @@
+import json
+import os
+import numpy as np
+from concurrent.futures import Executor
+from typing import Dict, Iterable, List, Optional
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from application.interval import check_x_x0
+from application.methods.numerical_method import NumericalMethod
+from application.parallel import create_process_executor, submit_method
+from application.replot import PLOT, draw_plot
+
+
+# Types of figures
+GRAPH = "GRAPH"
+LTE = "LTE"
+GTE = "GTE"
+GTE_DEPENDENCY = "GTE_D"
+# Supported formats of images
+IMAGE_EXTENSIONS = (".png", ".svg", ".pdf")
+# Default size of figure in inches and resolution of raster images
+FIGURE_SIZE = (8, 6)
+FIGURE_DPI = 100
+EXACT_LABEL = "Exact solution"
+EXACT_COLOR = "b"
+
+
+def _render_figure(output: str, title: str, xlabel: str, ylabel: str, graphs: Dict[str, dict],
+                   size: tuple, dpi: int):
+    """
+    Render figure offscreen with Agg canvas. Pyplot is not used, so figures can be rendered in any process
+
+    :param output: path of image (format by extension)
+    :param title: title of plot
+    :param xlabel: x axis name
+    :param ylabel: y axis name
+    :param graphs: graphs info: [name: {"x": values, "y": values, "color": color, "label": label}]
+    :param size: size of figure in inches
+    :param dpi: resolution of raster images
+    :return: path of image
+    """
+    figure = Figure(figsize=size, dpi=dpi)
+    FigureCanvasAgg(figure)
+    draw_plot(figure.add_subplot(), PLOT, title, xlabel, ylabel, graphs)
+    figure.savefig(output)
+    return output
+
+
+def _get_solve_key(spec: dict, name: str):
+    """
+    Get key of solve, which is needed for figure. Figures with the same key share one solve
+
+    :param spec: figure spec
+    :param name: name of method
+    :return: (name, attribute of method, arguments)
+    """
+    threshold = spec.get("threshold", None)
+    dtype = np.dtype(spec.get("dtype", "float64")).type
+    if spec["type"] == GTE_DEPENDENCY:
+        return name, "get_gte_dependency", (float(spec["x0"]), float(spec["y0"]), float(spec["x"]),
+                                            int(spec["from"]), int(spec["to"]), threshold, None, dtype)
+    return name, "compute", (float(spec["x0"]), float(spec["y0"]), float(spec["x"]), int(spec["n"]),
+                             threshold, None, dtype)
+
+
+def _check_spec(spec: dict, methods: Dict[str, NumericalMethod]):
+    """
+    Check figure spec before solving
+
+    :param spec: figure spec
+    :param methods: registry of methods (name -> method)
+    :return:
+    """
+    if spec.get("type") not in (GRAPH, LTE, GTE, GTE_DEPENDENCY):
+        raise ValueError(f"Unknown type of figure {spec.get('type')}!", {"type": "type"})
+    if os.path.splitext(spec["output"])[1].lower() not in IMAGE_EXTENSIONS:
+        raise ValueError(f"Unknown format of {spec['output']}!", {"output": "output"})
+    if spec["type"] != GRAPH and not spec.get("methods"):
+        raise ValueError("You must choose method!", {"methods": "methods"})
+    for name in spec.get("methods", ()):
+        if name not in methods:
+            raise ValueError(f"Unknown method {name}!", {"methods": "methods"})
+    check_x_x0(float(spec["x0"]), float(spec["x"]))
+    if spec["type"] == GTE_DEPENDENCY:
+        if int(spec["from"]) >= int(spec["to"]):
+            raise ValueError("From must be less then to!", {"from": "from", "to": "to"})
+    elif int(spec["n"]) <= 0:
+        raise ValueError("N must be positive!", {"n": "n"})
+
+
+def _get_graphs(spec: dict, solves: Dict[tuple, tuple], exact: Dict[tuple, tuple], styles: Dict[str, dict]):
+    """
+    Collect graphs of figure from computed solves
+
+    :param spec: figure spec
+    :param solves: results of solves (solve key -> result)
+    :param exact: exact solutions ((x0, y0, x) -> (x, y)), empty without analytical solution
+    :param styles: styles of methods (name -> {"label": label, "color": color})
+    :return: graphs info
+    """
+    graphs = dict()
+    for name in spec.get("methods", ()):
+        result = solves[_get_solve_key(spec, name)]
+        style = styles.get(name, dict())
+        if spec["type"] == GTE_DEPENDENCY:
+            x_, y_ = result
+        else:
+            x_, approximation, lte, gte = result
+            y_ = approximation if spec["type"] == GRAPH else lte if spec["type"] == LTE else gte
+        graphs[name] = {"x": x_, "y": y_, "label": style.get("label", name), "color": style.get("color", None)}
+
+    point = (float(spec["x0"]), float(spec["y0"]), float(spec["x"]))
+    if spec["type"] == GRAPH and point in exact:
+        exact_x, exact_y = exact[point]
+        graphs["exact"] = {"x": exact_x, "y": exact_y, "label": EXACT_LABEL, "color": EXACT_COLOR}
+    return graphs
+
+
+def render_report(methods: Dict[str, NumericalMethod], specs: Iterable[dict],
+                  styles: Optional[Dict[str, dict]] = None, workers: Optional[int] = None,
+                  executor: Optional[Executor] = None) -> List[str]:
+    """
+    Render figures offscreen to PNG, SVG or PDF.
+    Every distinct solve is computed once and shared by all figures, which need it
+    (approximation, LTE and GTE of the same problem need one compute per method).
+    Solves and rendering run in process pool
+
+    :param methods: registry of methods (name -> method)
+    :param specs: figure specs: {"output": path of image, "type": GRAPH, LTE, GTE or GTE_D,
+                  "methods": names of methods, "x0", "y0", "x", "n" (or "from", "to" for GTE_D),
+                  optional "threshold", "dtype", "title", "xlabel", "ylabel", "size", "dpi"}
+    :param styles: styles of methods (name -> {"label": label, "color": color}), names by default
+    :param workers: number of processes (number of CPUs by default)
+    :param executor: executor with methods registry (process pool is created by default)
+    :return: paths of images in order of specs
+    """
+    specs = list(specs)
+    styles = styles if styles is not None else dict()
+    for spec in specs:
+        _check_spec(spec, methods)
+
+    keys = list(dict.fromkeys(
+        _get_solve_key(spec, name) for spec in specs for name in spec.get("methods", ())
+    ))
+    own_executor = executor is None
+    if own_executor:
+        executor = create_process_executor(methods, workers)
+    try:
+        futures = [submit_method(executor, name, methods[name], attr, *args) for name, attr, args in keys]
+
+        # Exact solution is cheap, it is computed while methods are solved
+        exact = dict()
+        method = next(iter(methods.values()), None)
+        if method is not None and method.has_solution():
+            for spec in specs:
+                if spec["type"] == GRAPH:
+                    point = (float(spec["x0"]), float(spec["y0"]), float(spec["x"]))
+                    if point not in exact:
+                        exact[point] = method.solution(*point)
+        solves = {key: future.result() for key, future in zip(keys, futures)}
+
+        futures = [
+            executor.submit(
+                _render_figure, spec["output"], spec.get("title", None), spec.get("xlabel", None),
+                spec.get("ylabel", None), _get_graphs(spec, solves, exact, styles),
+                tuple(spec.get("size", FIGURE_SIZE)), int(spec.get("dpi", FIGURE_DPI))
+            )
+            for spec in specs
+        ]
+        return [future.result() for future in futures]
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+
+def render_report_file(methods: Dict[str, NumericalMethod], path: str, workers: Optional[int] = None):
+    """
+    Render figures from JSON file with list of figure specs
+
+    :param methods: registry of methods (name -> method)
+    :param path: path of JSON file
+    :param workers: number of processes (number of CPUs by default)
+    :return: paths of images
+    """
+    with open(path) as file:
+        specs = json.load(file)
+    return render_report(methods, specs, workers=workers)
@@ -0,0 +1,205 @@
+import json
+import struct
+import zipfile
+import numpy as np
+from typing import Dict, Tuple
+
+
+# Columnar format: magic, length of JSON header (uint64, little endian), header, aligned columns
+COLUMNS_MAGIC = b"DECOLS01"
+COLUMNS_ALIGNMENT = 64
+COLUMNS_EXTENSION = ".cols"
+NPZ_EXTENSION = ".npz"
+META_NAME = "__meta__"
+
+
+def _align(offset: int):
+    """
+    Align offset of column
+
+    :param offset: offset in bytes
+    :return: aligned offset
+    """
+    return -(-offset // COLUMNS_ALIGNMENT) * COLUMNS_ALIGNMENT
+
+
+def save_npz(path: str, arrays: Dict[str, np.ndarray], meta: dict):
+    """
+    Save arrays and metadata to uncompressed npz, so arrays can be memory-mapped
+
+    :param path: path of file
+    :param arrays: arrays (name -> array)
+    :param meta: JSON serializable metadata
+    :return:
+    """
+    if META_NAME in arrays:
+        raise ValueError(f"Name {META_NAME} is reserved!")
+    meta = np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8)
+    with open(path, "wb") as file:
+        np.savez(file, **{META_NAME: meta}, **{name: np.ascontiguousarray(array) for name, array in arrays.items()})
+
+
+def load_npz(path: str) -> Tuple[Dict[str, np.ndarray], dict]:
+    """
+    Load arrays from uncompressed npz as read-only memory maps
+
+    :param path: path of file
+    :return: arrays (name -> array), metadata
+    """
+    arrays = dict()
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as file:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{info.filename} is compressed and can not be memory-mapped!")
+
+            # Skip local file header to .npy data
+            file.seek(info.header_offset)
+            header = file.read(30)
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+
+            name = info.filename[:-len(".npy")]
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=file.tell(), shape=shape,
+                                         order="F" if fortran_order else "C")
+
+    meta = json.loads(bytes(arrays.pop(META_NAME)).decode("utf-8"))
+    return arrays, meta
+
+
+def save_columns(path: str, arrays: Dict[str, np.ndarray], meta: dict):
+    """
+    Save arrays and metadata to columnar file: JSON header and aligned raw columns
+
+    :param path: path of file
+    :param arrays: arrays (name -> array)
+    :param meta: JSON serializable metadata
+    :return:
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    columns = [
+        {"name": name, "dtype": array.dtype.str, "shape": list(array.shape), "offset": 0}
+        for name, array in arrays.items()
+    ]
+
+    # Header length depends on offsets, so offsets are computed with large enough header
+    header = json.dumps({"meta": meta, "columns": columns}).encode("utf-8")
+    data_start = _align(len(COLUMNS_MAGIC) + 8 + len(header) + 32 * len(columns))
+    offset = data_start
+    for column, array in zip(columns, arrays.values()):
+        column["offset"] = offset
+        offset = _align(offset + array.nbytes)
+    header = json.dumps({"meta": meta, "columns": columns}).encode("utf-8")
+
+    with open(path, "wb") as file:
+        file.write(COLUMNS_MAGIC)
+        file.write(struct.pack("<Q", len(header)))
+        file.write(header)
+        for column, array in zip(columns, arrays.values()):
+            if file.tell() > column["offset"]:
+                raise RuntimeError("Header of columnar file is too large!")
+            file.write(b"\0" * (column["offset"] - file.tell()))
+            file.write(array.tobytes())
+
+
+def load_columns(path: str) -> Tuple[Dict[str, np.ndarray], dict]:
+    """
+    Load arrays from columnar file as read-only memory maps
+
+    :param path: path of file
+    :return: arrays (name -> array), metadata
+    """
+    with open(path, "rb") as file:
+        if file.read(len(COLUMNS_MAGIC)) != COLUMNS_MAGIC:
+            raise ValueError(f"{path} is not columnar file!")
+        header_length, = struct.unpack("<Q", file.read(8))
+        header = json.loads(file.read(header_length).decode("utf-8"))
+
+    arrays = dict()
+    for column in header["columns"]:
+        shape = tuple(column["shape"])
+        if int(np.prod(shape)) == 0:
+            arrays[column["name"]] = np.empty(shape, dtype=column["dtype"])
+        else:
+            arrays[column["name"]] = np.memmap(path, dtype=column["dtype"], mode="r", offset=column["offset"],
+                                               shape=shape)
+    return arrays, header["meta"]
+
+
+def save(path: str, arrays: Dict[str, np.ndarray], meta: dict):
+    """
+    Save arrays and metadata. Format is chosen by extension (.npz or .cols)
+
+    :param path: path of file
+    :param arrays: arrays (name -> array)
+    :param meta: JSON serializable metadata
+    :return:
+    """
+    if path.endswith(NPZ_EXTENSION):
+        save_npz(path, arrays, meta)
+    elif path.endswith(COLUMNS_EXTENSION):
+        save_columns(path, arrays, meta)
+    else:
+        raise ValueError(f"Unknown format of {path}!")
+
+
+def load(path: str) -> Tuple[Dict[str, np.ndarray], dict]:
+    """
+    Load arrays and metadata without copying. Format is chosen by extension (.npz or .cols)
+
+    :param path: path of file
+    :return: arrays (name -> array), metadata
+    """
+    if path.endswith(NPZ_EXTENSION):
+        return load_npz(path)
+    elif path.endswith(COLUMNS_EXTENSION):
+        return load_columns(path)
+    raise ValueError(f"Unknown format of {path}!")
+
+
+def save_plot(path: str, kind: str, title: str, xlabel: str, ylabel: str, graphs: Dict[str, dict]):
+    """
+    Save plotted graphs
+
+    :param path: path of file
+    :param kind: kind of plot ("plot", "family" or "dashboard")
+    :param title: title of plot
+    :param xlabel: x axis name
+    :param ylabel: y axis name (list of names for dashboard)
+    :param graphs: graphs info: [name: {"x": values, "y": values, "color": color, "label": label}],
+                   other JSON serializable fields (panel of dashboard) are saved as is
+    :return:
+    """
+    arrays = dict()
+    styles = dict()
+    for name, graph in graphs.items():
+        arrays[name + "/x"] = np.asarray(graph["x"])
+        arrays[name + "/y"] = np.asarray(graph["y"])
+        styles[name] = {"label": graph.get("label", None), "color": graph.get("color", None)}
+        styles[name].update({key: value for key, value in graph.items() if key not in ("x", "y", "label", "color")})
+    save(path, arrays, {"kind": kind, "title": title, "xlabel": xlabel, "ylabel": ylabel, "graphs": styles})
+
+
+def load_plot(path: str):
+    """
+    Load plotted graphs
+
+    :param path: path of file
+    :return: kind of plot, title, xlabel, ylabel, graphs
+    """
+    arrays, meta = load(path)
+    if "graphs" not in meta:
+        raise ValueError(f"{path} does not contain plot!")
+    graphs = {
+        name: {"x": arrays[name + "/x"], "y": arrays[name + "/y"], **style}
+        for name, style in meta["graphs"].items()
+    }
+    return meta["kind"], meta["title"], meta["xlabel"], meta["ylabel"], graphs
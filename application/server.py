@@ -0,0 +1,382 @@
+import base64
+import json
+import threading
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional
+from application.ensemble_runner import EnsembleRunner
+from application.interval import check_x_x0
+from application.methods.euler_method import EulerMethod
+from application.methods.improved_euler_method import ImprovedEulerMethod
+from application.methods.numerical_method import NumericalMethod
+from application.methods.runge_kutta_method import RungeKuttaMethod
+
+
+# Supported precisions of computation
+DTYPES = {"float32": np.float32, "float64": np.float64, "longdouble": np.longdouble}
+
+
+def create_methods(f: Callable[[float, float], float], solution: Optional[Callable[[float], float]]):
+    """
+    Create registry of default methods
+
+    :param f: target function
+    :param solution: analytical solution or None
+    :return: dict of methods (name -> method)
+    """
+    methods = [EulerMethod(f, solution), ImprovedEulerMethod(f, solution), RungeKuttaMethod(f, solution)]
+    return {type(method).__name__: method for method in methods}
+
+
+def encode_array(array: np.ndarray, encoding: str):
+    """
+    Encode array for JSON
+
+    :param array: array
+    :param encoding: "list" (NaN and inf are null) or "base64" (keeps precision of longdouble)
+    :return: list or dict with dtype, shape and base64 encoded bytes
+    """
+    if encoding == "base64":
+        array = np.ascontiguousarray(array)
+        return {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "data": base64.b64encode(array.tobytes()).decode("ascii")
+        }
+    # JSON numbers are doubles, longdouble can not be serialized. JSON has no NaN and inf
+    array = np.asarray(array)
+    if np.issubdtype(array.dtype, np.floating):
+        array = array.astype(np.float64)
+        return np.where(np.isfinite(array), array.astype(object), None).tolist()
+    return array.tolist()
+
+
+def decode_array(value):
+    """
+    Decode array from JSON
+
+    :param value: list (null is NaN) or dict with dtype, shape and base64 encoded bytes
+    :return: array
+    """
+    if isinstance(value, dict):
+        return np.frombuffer(base64.b64decode(value["data"]), dtype=value["dtype"]).reshape(value["shape"])
+    array = np.asarray(value)
+    if array.dtype == object:
+        array = np.array(array.tolist(), dtype=float)
+    return array
+
+
+class _ComputeBatcher:
+    def __init__(self, window: float):
+        """
+        Init batcher, which collects compute requests of the same problem and solves them in one vectorized pass
+
+        :param window: time of collecting requests in seconds
+        """
+        self._window = window
+        self._lock = threading.Lock()
+        self._pending: Dict[tuple, list] = dict()
+        self.batches = 0
+
+    def depth(self):
+        """
+        Get number of waiting requests
+
+        :return: int
+        """
+        with self._lock:
+            return sum(len(requests) for requests in self._pending.values())
+
+    def submit(self, method: NumericalMethod, lock: threading.Lock, key: tuple, y0: float) -> Future:
+        """
+        Add request to batch
+
+        :param method: numerical method
+        :param lock: lock of method
+        :param key: problem without y0: (method name, x0, x, n, None, dtype name)
+        :param y0: start point (y component)
+        :return: Future with x, y, lte, gte
+        """
+        future = Future()
+        with self._lock:
+            if key not in self._pending:
+                self._pending[key] = []
+                threading.Timer(self._window, self._flush, (method, lock, key)).start()
+            self._pending[key].append((y0, future))
+        return future
+
+    def _flush(self, method: NumericalMethod, lock: threading.Lock, key: tuple):
+        """
+        Solve collected batch
+
+        :return:
+        """
+        with self._lock:
+            requests = self._pending.pop(key)
+            self.batches += 1
+        _, x0, x, n, threshold, dtype = key
+
+        if len(requests) > 1:
+            try:
+                x_, y_, lte, gte = method.compute_ensemble(x0, np.array([y0 for y0, _ in requests]), x, n,
+                                                           threshold, DTYPES[dtype])
+            except Exception:
+                # Some initial value is bad, solve one by one to report error only to its request
+                pass
+            else:
+                for i, (_, future) in enumerate(requests):
+                    # Stopped trajectory is truncated as in compute
+                    last = n if not np.isnan(y_[i, -1]) else int(np.argmax(np.isnan(y_[i]))) - 1
+                    future.set_result((x_[:last + 1], y_[i, :last + 1], lte[i, :last + 1], gte[i, :last + 1]))
+                return
+
+        for y0, future in requests:
+            try:
+                with lock:
+                    future.set_result(method.compute(x0, y0, x, n, threshold, None, DTYPES[dtype]))
+            except Exception as e:
+                future.set_exception(e)
+
+
+class ComputeServer(ThreadingHTTPServer):
+    # Number of stored latencies
+    LATENCY_HISTORY = 1000
+
+    def __init__(self, methods: Dict[str, NumericalMethod], host: str = "127.0.0.1", port: int = 0,
+                 batch_window: float = 0.005):
+        """
+        Init local JSON-over-HTTP server for numerical methods
+
+        :param methods: registry of methods (name -> method)
+        :param host: host, localhost by default
+        :param port: port, any free port by default
+        :param batch_window: time of collecting compute requests of the same problem in seconds
+        """
+        super().__init__((host, port), _ComputeHandler)
+        self.methods = methods
+        self.locks = {name: threading.Lock() for name in methods}
+        self.batcher = _ComputeBatcher(batch_window)
+        self._metrics_lock = threading.Lock()
+        self._latencies = deque(maxlen=self.LATENCY_HISTORY)
+        self._requests = 0
+        self._in_flight = 0
+
+    def request_started(self):
+        """
+        Register started request
+
+        :return: start time
+        """
+        with self._metrics_lock:
+            self._in_flight += 1
+        return time.perf_counter()
+
+    def request_finished(self, start: float):
+        """
+        Register finished request
+
+        :param start: start time
+        :return:
+        """
+        with self._metrics_lock:
+            self._in_flight -= 1
+            self._requests += 1
+            self._latencies.append(time.perf_counter() - start)
+
+    def get_metrics(self):
+        """
+        Get queue depth and latency percentiles
+
+        :return: dict of metrics
+        """
+        with self._metrics_lock:
+            latencies = np.array(self._latencies) * 1000
+            metrics = {"requests": self._requests, "in_flight": self._in_flight}
+        metrics["queue_depth"] = self.batcher.depth()
+        metrics["batches"] = self.batcher.batches
+        metrics["latency_ms"] = {
+            f"p{p}": float(np.percentile(latencies, p)) if len(latencies) else None for p in (50, 90, 99)
+        }
+        return metrics
+
+
+class _ComputeHandler(BaseHTTPRequestHandler):
+    server: ComputeServer
+
+    def log_message(self, format: str, *args):
+        """
+        Do not log every request
+
+        :return:
+        """
+
+    def _send_json(self, status: int, body: dict):
+        """
+        Send JSON response
+
+        :param status: HTTP status
+        :param body: response
+        :return:
+        """
+        try:
+            data = json.dumps(body, allow_nan=False).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            status = 500
+            data = json.dumps({"error": f"Response can not be encoded: {e}", "fields": []}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        """
+        GET /metrics
+
+        :return:
+        """
+        if self.path == "/metrics":
+            self._send_json(200, self.server.get_metrics())
+        else:
+            self._send_json(404, {"error": f"Unknown path {self.path}!"})
+
+    def do_POST(self):
+        """
+        POST /compute, /gte_dependency, /tolerance, /ensemble
+
+        :return:
+        """
+        routes = {
+            "/compute": self._compute,
+            "/gte_dependency": self._gte_dependency,
+            "/tolerance": self._tolerance,
+            "/ensemble": self._ensemble
+        }
+        if self.path not in routes:
+            self._send_json(404, {"error": f"Unknown path {self.path}!"})
+            return
+
+        start = self.server.request_started()
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            if request.get("method") not in self.server.methods:
+                raise ValueError(f"Unknown method {request.get('method')}!")
+            if request.get("dtype", "float64") not in DTYPES:
+                raise ValueError(f"Unknown dtype {request.get('dtype')}!")
+            check_x_x0(float(request["x0"]), float(request["x"]))
+            response = routes[self.path](request)
+        except KeyError as e:
+            self._send_json(400, {"error": f"Missing field {e.args[0]}!", "fields": []})
+        except (ValueError, TypeError) as e:
+            # Bad request or input values
+            self._send_json(400, {
+                "error": str(e.args[0]) if e.args else type(e).__name__,
+                "fields": list(e.args[1].values()) if len(e.args) > 1 and isinstance(e.args[1], dict) else []
+            })
+        except Exception as e:
+            # Unexpected error must not drop connection
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}", "fields": []})
+        else:
+            self._send_json(200, response)
+        finally:
+            self.server.request_finished(start)
+
+    def _encode(self, request: dict, **arrays: np.ndarray):
+        """
+        Encode arrays of response
+
+        :param request: request
+        :param arrays: arrays of response
+        :return: dict of encoded arrays
+        """
+        return {name: encode_array(array, request.get("encoding", "list")) for name, array in arrays.items()}
+
+    def _compute(self, request: dict):
+        """
+        Compute approximation, lte and gte. Requests of the same problem without threshold are batched
+        """
+        key = (request["method"], float(request["x0"]), float(request["x"]), int(request["n"]),
+               request.get("threshold"), request.get("dtype", "float64"))
+        if key[3] <= 0:
+            raise ValueError("N must be positive!", {"n": "n"})
+        if key[4] is not None:
+            # Only compute locates threshold crossing, batched result would depend on other requests
+            with self.server.locks[key[0]]:
+                x_, y_, lte, gte = self.server.methods[key[0]].compute(key[1], float(request["y0"]), key[2], key[3],
+                                                                       key[4], None, DTYPES[key[5]])
+            return self._encode(request, x=x_, y=y_, lte=lte, gte=gte)
+
+        future = self.server.batcher.submit(self.server.methods[key[0]], self.server.locks[key[0]], key,
+                                            float(request["y0"]))
+        x_, y_, lte, gte = future.result()
+        return self._encode(request, x=x_, y=y_, lte=lte, gte=gte)
+
+    def _gte_dependency(self, request: dict):
+        """
+        Compute dependency of max absolute gte from N, all N are computed simultaneously in lockstep mode
+        """
+        if int(request["from"]) >= int(request["to"]):
+            raise ValueError("From must be less then to!", {"from": "from", "to": "to"})
+        args = (float(request["x0"]), float(request["y0"]), float(request["x"]), int(request["from"]),
+                int(request["to"]), request.get("threshold"))
+        dtype = DTYPES[request.get("dtype", "float64")]
+        with self.server.locks[request["method"]]:
+            if request.get("lockstep"):
+                ns_, gte_d_ = self.server.methods[request["method"]].get_gte_dependency_lockstep(*args, dtype)
+            else:
+                ns_, gte_d_ = self.server.methods[request["method"]].get_gte_dependency(*args, None, dtype)
+        return self._encode(request, ns=ns_, gte_d=gte_d_)
+
+    def _tolerance(self, request: dict):
+        """
+        Find minimal N, for which max absolute gte does not exceed tolerance
+        """
+        with self.server.locks[request["method"]]:
+            n, max_gte = self.server.methods[request["method"]].find_n_for_tolerance(
+                float(request["x0"]), float(request["y0"]), float(request["x"]), float(request["tolerance"]),
+                int(request["max_n"]), request.get("threshold"), DTYPES[request.get("dtype", "float64")]
+            )
+        return {"n": n, "max_gte": float(max_gte) if np.isfinite(max_gte) else None}
+
+    def _ensemble(self, request: dict):
+        """
+        Compute approximation and gte for array of initial values. Workers are used if they are requested
+        """
+        method = self.server.methods[request["method"]]
+        y0 = decode_array(request["y0"]).astype(float)
+        x0, x, n = float(request["x0"]), float(request["x"]), int(request["n"])
+        dtype = DTYPES[request.get("dtype", "float64")]
+        if n <= 0:
+            raise ValueError("N must be positive!", {"n": "n"})
+        if request.get("workers"):
+            x_, y_, gte = EnsembleRunner(method, int(request["workers"])).run(
+                x0, y0, x, n, request.get("threshold"), dtype
+            )
+        else:
+            x_, y_, _, gte = method.compute_ensemble(x0, y0, x, n, request.get("threshold"), dtype)
+        return self._encode(request, x=x_, y=y_, gte=gte)
+
+
+def serve(f: Callable[[float, float], float], solution: Callable[[float], float], host: str = "127.0.0.1",
+          port: int = 8000, batch_window: float = 0.005):
+    """
+    Run server until interrupted
+
+    :param f: target function
+    :param solution: analytical solution
+    :param host: host
+    :param port: port
+    :param batch_window: time of collecting compute requests of the same problem in seconds
+    :return:
+    """
+    server = ComputeServer(create_methods(f, solution), host, port, batch_window)
+    print(f"Serving on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,110 @@
+import numpy as np
+from collections import OrderedDict
+from math import floor, log2
+from typing import Callable, Tuple
+
+
+class SlopeField:
+    def __init__(self, f: Callable[[float, float], float], density: int = 25, tile_size: int = 8,
+                 max_tiles: int = 4096):
+        """
+        Init slope field of y' = f(x, y).
+        Plane is split into tiles of tile_size x tile_size points, computed tiles are cached,
+        so panning computes only newly exposed tiles
+
+        :param f: target function
+        :param density: approximate number of points along each axis of view
+        :param tile_size: number of points along each axis of tile
+        :param max_tiles: max number of cached tiles
+        """
+        self._f = f
+        self._density = density
+        self._tile_size = tile_size
+        self._max_tiles = max_tiles
+        self._tiles: OrderedDict = OrderedDict()
+
+    def _evaluate_f(self, x: np.ndarray, y: np.ndarray):
+        """
+        Evaluate target function at all points with one vectorized call.
+        Scalar-only function is evaluated point by point
+
+        :param x: x components
+        :param y: y components
+        :return: values of target function
+        """
+        with np.errstate(all="ignore"):
+            try:
+                values = np.asarray(self._f(x, y), dtype=float)
+                if values.shape == x.shape:
+                    return values
+            except (TypeError, ValueError):
+                pass
+            return np.fromiter((self._f(x_, y_) for x_, y_ in zip(x, y)), dtype=float, count=len(x))
+
+    @staticmethod
+    def _get_spacing(low: float, high: float, density: int):
+        """
+        Get exponent of spacing between points. Spacing is power of 2, so small zoom keeps cached tiles
+
+        :param low: start of view
+        :param high: end of view
+        :param density: number of points along view
+        :return: exponent of spacing
+        """
+        return floor(log2(max(high - low, 10 ** -12) / density))
+
+    def _compute_tiles(self, keys: list):
+        """
+        Compute missing tiles with one vectorized call
+
+        :param keys: keys of tiles (x exponent, y exponent, x index, y index)
+        :return:
+        """
+        local = np.arange(self._tile_size)
+        xs, ys = [], []
+        for ex, ey, tx, ty in keys:
+            x, y = np.meshgrid((tx * self._tile_size + local) * 2.0 ** ex, (ty * self._tile_size + local) * 2.0 ** ey)
+            xs.append(x.ravel())
+            ys.append(y.ravel())
+
+        x, y = np.concatenate(xs), np.concatenate(ys)
+        slope = self._evaluate_f(x, y)
+        with np.errstate(all="ignore"):
+            norm = np.sqrt(1 + slope ** 2)
+            u, v = 1 / norm, slope / norm
+        u[~np.isfinite(slope)] = np.nan
+        v[~np.isfinite(slope)] = np.nan
+
+        points = self._tile_size ** 2
+        for i, key in enumerate(keys):
+            part = slice(i * points, (i + 1) * points)
+            self._tiles[key] = (x[part], y[part], u[part], v[part])
+            if len(self._tiles) > self._max_tiles:
+                self._tiles.popitem(last=False)
+
+    def evaluate(self, xlim: Tuple[float, float], ylim: Tuple[float, float]):
+        """
+        Get slope field in view rectangle
+
+        :param xlim: view along x
+        :param ylim: view along y
+        :return: x, y and normalized direction (u, v) of points inside view
+        """
+        ex = self._get_spacing(xlim[0], xlim[1], self._density)
+        ey = self._get_spacing(ylim[0], ylim[1], self._density)
+        x_tile, y_tile = self._tile_size * 2.0 ** ex, self._tile_size * 2.0 ** ey
+        keys = [
+            (ex, ey, tx, ty)
+            for tx in range(floor(xlim[0] / x_tile), floor(xlim[1] / x_tile) + 1)
+            for ty in range(floor(ylim[0] / y_tile), floor(ylim[1] / y_tile) + 1)
+        ]
+
+        missing = [key for key in keys if key not in self._tiles]
+        if missing:
+            self._compute_tiles(missing)
+        for key in keys:
+            self._tiles.move_to_end(key)
+
+        x, y, u, v = (np.concatenate(parts) for parts in zip(*(self._tiles[key] for key in keys)))
+        inside = (xlim[0] <= x) & (x <= xlim[1]) & (ylim[0] <= y) & (y <= ylim[1])
+        return x[inside], y[inside], u[inside], v[inside]
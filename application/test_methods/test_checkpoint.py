@@ -0,0 +1,122 @@
+import math
+import os
+import tempfile
+from functools import partial
+import numpy as np
+from unittest import TestCase
+from application.checkpoint import load_checkpoint, save_checkpoint
+from application.ensemble_runner import EnsembleRunner
+from application.methods.euler_method import EulerMethod
+from application.methods.runge_kutta_method import RungeKuttaMethod
+
+
+class _Scaled:
+    """
+    Callable target function with parameter
+    """
+
+    def __init__(self, scale: float):
+        self.scale = scale
+
+    def __call__(self, x: float, y: float):
+        return self.scale * y
+
+
+# Some tests
+class TestCheckpoint(TestCase):
+    def setUp(self):
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__f = lambda x, y: (y ** 2 + x * y - x ** 2) / x ** 2
+        self.__solution = lambda x: x * (1 + x ** 2 / 3) / (1 - x ** 2 / 3)
+        self.__rk_m = RungeKuttaMethod(self.__f, self.__solution)
+
+    def tearDown(self):
+        self.__directory.cleanup()
+
+    def test_save_load(self):
+        path = os.path.join(self.__directory.name, "state.npz")
+        self.assertTrue(load_checkpoint(path, "hash") is None)
+        save_checkpoint(path, {"a": np.arange(5)}, "hash")
+        save_checkpoint(path, {"a": np.arange(6)}, "hash")
+        self.assertEqual(os.listdir(self.__directory.name), ["state.npz"])
+        self.assertTrue(np.array_equal(load_checkpoint(path, "hash")["a"], np.arange(6)))
+        self.assertRaises(ValueError, load_checkpoint, path, "other")
+
+    def test_definition_hash(self):
+        same = RungeKuttaMethod(lambda x, y: (y ** 2 + x * y - x ** 2) / x ** 2, self.__solution)
+        self.assertEqual(self.__rk_m.get_definition_hash(1, 2), same.get_definition_hash(1, 2))
+        self.assertNotEqual(self.__rk_m.get_definition_hash(1, 2), same.get_definition_hash(1, 3))
+        self.assertNotEqual(self.__rk_m.get_definition_hash(1, 2),
+                            EulerMethod(self.__f, self.__solution).get_definition_hash(1, 2))
+        self.assertNotEqual(self.__rk_m.get_definition_hash(1, 2),
+                            RungeKuttaMethod(lambda x, y: y, self.__solution).get_definition_hash(1, 2))
+
+        # Hash does not depend on addresses of partials and callable objects
+        g = lambda scale, x, y: scale * y
+        self.assertEqual(RungeKuttaMethod(partial(g, 2.0), None).get_definition_hash(1, 2),
+                         RungeKuttaMethod(partial(g, 2.0), None).get_definition_hash(1, 2))
+        self.assertNotEqual(RungeKuttaMethod(partial(g, 2.0), None).get_definition_hash(1, 2),
+                            RungeKuttaMethod(partial(g, 3.0), None).get_definition_hash(1, 2))
+        self.assertEqual(RungeKuttaMethod(_Scaled(2.0), None).get_definition_hash(1, 2),
+                         RungeKuttaMethod(_Scaled(2.0), None).get_definition_hash(1, 2))
+        self.assertNotEqual(RungeKuttaMethod(_Scaled(2.0), None).get_definition_hash(1, 2),
+                            RungeKuttaMethod(_Scaled(3.0), None).get_definition_hash(1, 2))
+        self.assertEqual(RungeKuttaMethod(lambda x, y: math.exp(x) * y, None).get_definition_hash(1, 2),
+                         RungeKuttaMethod(lambda x, y: math.exp(x) * y, None).get_definition_hash(1, 2))
+
+        # Changed module constant changes hash
+        namespace = {"SCALE": 2.0}
+        exec("def f(x, y):\n    return SCALE * y", namespace)
+        definition_hash = RungeKuttaMethod(namespace["f"], None).get_definition_hash(1, 2)
+        namespace["SCALE"] = 3.0
+        self.assertNotEqual(RungeKuttaMethod(namespace["f"], None).get_definition_hash(1, 2), definition_hash)
+
+    def test_gte_dependency_resume(self):
+        path = os.path.join(self.__directory.name, "gte.npz")
+        expected_ns, expected_gte_d = self.__rk_m.get_gte_dependency(1, 2, 1.5, 5, 15)
+        ns_, gte_d_ = self.__rk_m.get_gte_dependency(1, 2, 1.5, 5, 15, checkpoint=path)
+        self.assertTrue(np.array_equal(gte_d_, expected_gte_d))
+
+        # Mark finished N, resumed sweep must not recompute them
+        definition_hash = self.__rk_m.get_definition_hash("gte_dependency", 1.0, 2.0, 1.5, 5, 15, None, None, "<f8")
+        state = load_checkpoint(path, definition_hash)
+        state["gte_d"][:5] = -1
+        state["done"][5:] = False
+        save_checkpoint(path, state, definition_hash)
+        ns_, gte_d_ = self.__rk_m.get_gte_dependency(1, 2, 1.5, 5, 15, checkpoint=path, resume=True)
+        self.assertTrue(np.all(gte_d_[:5] == -1))
+        self.assertTrue(np.array_equal(gte_d_[5:], expected_gte_d[5:]))
+
+        self.assertRaises(ValueError, self.__rk_m.get_gte_dependency, 1, 2, 1.5, 5, 16, checkpoint=path,
+                          resume=True)
+
+    def test_ensemble_resume(self):
+        path = os.path.join(self.__directory.name, "ensemble.cols")
+        y0 = np.linspace(0.5, 3, 23)
+        runner = EnsembleRunner(self.__rk_m, workers=2, chunk_size=4)
+        expected_x, expected_y, expected_gte = runner.run(1, y0, 1.5, 5)
+        x_, y_, gte = runner.run(1, y0, 1.5, 5, checkpoint=path)
+        self.assertTrue(np.array_equal(y_, expected_y) and np.array_equal(gte, expected_gte))
+
+        definition_hash = self.__rk_m.get_definition_hash("ensemble", 1.0, y0, 1.5, 5, None, "<f8")
+        state = load_checkpoint(path, definition_hash)
+        self.assertTrue(np.all(state["done"]))
+        state["y"][:8] = -1
+        state["done"][8:] = False
+        save_checkpoint(path, state, definition_hash)
+
+        # Different chunk size recomputes only chunks with not computed initial values
+        x_, y_, gte = EnsembleRunner(self.__rk_m, workers=3, chunk_size=3).run(1, y0, 1.5, 5, checkpoint=path,
+                                                                               resume=True)
+        self.assertTrue(np.all(y_[:6] == -1))
+        self.assertTrue(np.array_equal(y_[9:], expected_y[9:]))
+        self.assertRaises(ValueError, runner.run, 1, y0[1:], 1.5, 5, checkpoint=path, resume=True)
+
+        # Without analytical solution initial values near zero are allowed
+        path = os.path.join(self.__directory.name, "estimated.npz")
+        runner = EnsembleRunner(RungeKuttaMethod(self.__f, None), workers=2, chunk_size=4)
+        y0 = np.linspace(-1, 1, 9)
+        expected_x, expected_y, expected_gte = runner.run(1, y0, 1.5, 5)
+        x_, y_, gte = runner.run(1, y0, 1.5, 5, checkpoint=path, resume=True)
+        self.assertTrue(np.array_equal(y_, expected_y) and np.array_equal(gte, expected_gte))
+        self.assertTrue(np.all(np.isfinite(gte)))
@@ -0,0 +1,206 @@
+import logging
+import numpy as np
+from unittest import TestCase
+from application.middleware import Midleware
+from application.gui.qui_configurator import GuiConfigurator
+from application.methods.euler_method import EulerMethod
+from application.methods.runge_kutta_method import RungeKuttaMethod
+
+
+class _RecordingCanvas:
+    """
+    Canvas without GUI, which remembers last plotted graphs
+    """
+
+    def __init__(self):
+        self.title = None
+        self.slope_field = None
+        self.graphs = None
+
+    def plot(self, title: str = None, xlabel: str = None, ylabel: str = None, slope_field=None, **kwargs):
+        self.title = title
+        self.slope_field = slope_field
+        self.graphs = kwargs
+
+    def plot_family(self, title: str = None, xlabel: str = None, ylabel: str = None, **kwargs):
+        self.plot(title, xlabel, ylabel, **kwargs)
+
+    def plot_dashboard(self, title: str = None, xlabel: str = None, ylabels=(), slope_field=None, **kwargs):
+        self.ylabels = ylabels
+        self.plot(title, xlabel, None, slope_field, **kwargs)
+
+
+# Some tests
+class TestMidleware(TestCase):
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO)
+        self.__logger = logging.getLogger(__name__)
+        self.__x0 = 1
+        self.__y0 = 2
+        self.__x = 1.5
+        self.__n = 5
+        self.__max_n = 15
+        self.__f = lambda x, y: (y ** 2 + x * y - x ** 2) / x ** 2
+        self.__solution = lambda x: x * (1 + x ** 2 / 3) / (1 - x ** 2 / 3)
+        self.__midleware = Midleware(self.__f, self.__solution)
+        self.__sc = _RecordingCanvas()
+
+    def tearDown(self):
+        self.__midleware.shutdown()
+
+    def __plot_all(self, graph_type: str):
+        self.__midleware.plot_graphs(self.__sc, self.__x0, self.__y0, self.__x, self.__n, title="test",
+                                     graph_type=graph_type, show_euler=True, show_improved_euler=True,
+                                     show_runge_kutta=True)
+        return self.__sc.graphs
+
+    def test_parallel_order(self):
+        graphs = self.__plot_all(GuiConfigurator.GTE)
+        self.assertEqual(list(graphs.keys()), ["EulerMethod", "ImprovedEulerMethod", "RungeKuttaMethod"])
+
+    def test_process_pool(self):
+        expected = self.__plot_all(GuiConfigurator.LTE)
+        self.__midleware.use_process_pool(2)
+        graphs = self.__plot_all(GuiConfigurator.LTE)
+        self.assertEqual(list(graphs.keys()), list(expected.keys()))
+        for name, graph in graphs.items():
+            self.assertTrue(np.array_equal(graph["y"], expected[name]["y"]))
+
+        # Workers are already forked, method registered after that must be visible to them
+        self.__midleware.register_method("Extra", EulerMethod(self.__f, self.__solution))
+        self.__midleware.plot_graphs(self.__sc, self.__x0, self.__y0, self.__x, self.__n, title="test",
+                                     graph_type=GuiConfigurator.LTE, methods=["Extra"])
+        self.assertTrue(np.array_equal(self.__sc.graphs["Extra"]["y"], expected["EulerMethod"]["y"]))
+
+    def test_should_stop(self):
+        expected = self.__plot_all(GuiConfigurator.GTE)
+        graphs = self.__midleware.compute_graphs(self.__x0, self.__y0, self.__x, self.__n,
+                                                 graph_type=GuiConfigurator.GTE, show_euler=True,
+                                                 show_improved_euler=True, show_runge_kutta=True,
+                                                 should_stop=lambda: False)
+        for name, graph in graphs.items():
+            self.assertTrue(np.array_equal(graph["y"], expected[name]["y"]))
+
+        # Stale solve is cancelled in the middle
+        checks = []
+        self.assertRaises(ValueError, self.__midleware.compute_graphs, self.__x0, self.__y0, self.__x, 10 ** 6,
+                          graph_type=GuiConfigurator.GRAPH, show_runge_kutta=True,
+                          should_stop=lambda: checks.append(None) or len(checks) > 10)
+        self.assertEqual(len(checks), 11)
+
+    def test_registered_method(self):
+        self.__midleware.register_method("Extra", EulerMethod(self.__f, self.__solution), "Extra", "k")
+        self.__midleware.plot_gte_dependency(self.__sc, self.__x0, self.__y0, self.__x, self.__n, self.__max_n,
+                                             title="test", show_runge_kutta=True, methods=["Extra"])
+        self.assertEqual(list(self.__sc.graphs.keys()), ["RungeKuttaMethod", "Extra"])
+        self.assertEqual(self.__sc.graphs["Extra"]["color"], "k")
+        self.__logger.info(f"Extra method: gte_d = {self.__sc.graphs['Extra']['y']}")
+        self.assertRaises(ValueError, self.__midleware.register_method, "Extra",
+                          EulerMethod(self.__f, self.__solution))
+
+    def test_dense_output(self):
+        self.__midleware.plot_graphs(self.__sc, self.__x0, self.__y0, self.__x, self.__n, title="test",
+                                     graph_type=GuiConfigurator.GRAPH, show_runge_kutta=True, dense_output=True)
+        graphs = self.__sc.graphs
+        self.assertTrue(self.__sc.slope_field is None)
+        self.assertTrue(np.array_equal(graphs["RungeKuttaMethod"]["x"], graphs["exact"]["x"]))
+        self.assertTrue(np.allclose(graphs["RungeKuttaMethod"]["y"], graphs["exact"]["y"], atol=10 ** -1))
+
+    def test_ensemble(self):
+        y0 = np.linspace(0.5, 3, 37)
+        x_, y_, gte = self.__midleware.solve_ensemble("RungeKuttaMethod", self.__x0, y0, self.__x, self.__n,
+                                                      workers=3, chunk_size=5)
+        expected_x, expected_y, _, expected_gte = RungeKuttaMethod(self.__f, self.__solution).compute_ensemble(
+            self.__x0, y0, self.__x, self.__n
+        )
+        self.assertTrue(np.array_equal(x_, expected_x))
+        self.assertTrue(np.array_equal(y_, expected_y))
+        self.assertTrue(np.array_equal(gte, expected_gte))
+        self.assertRaises(ValueError, self.__midleware.solve_ensemble, "RungeKuttaMethod", self.__x0, [0.0],
+                          self.__x, self.__n)
+
+        # Without analytical solution gte is estimated by step doubling
+        midleware = Midleware(self.__f, None)
+        try:
+            x_, y_, gte = midleware.solve_ensemble("RungeKuttaMethod", self.__x0, y0, self.__x, self.__n,
+                                                   workers=3, chunk_size=5)
+        finally:
+            midleware.shutdown()
+        _, expected_y, _, expected_gte = RungeKuttaMethod(self.__f, None).compute_ensemble(
+            self.__x0, y0, self.__x, self.__n
+        )
+        self.assertTrue(np.array_equal(y_, expected_y))
+        self.assertTrue(np.array_equal(gte, expected_gte))
+
+    def test_family(self):
+        y0 = np.linspace(1, 3, 50)
+        self.__midleware.plot_family(self.__sc, self.__x0, y0, self.__x, self.__n, title="test",
+                                     show_euler=True, show_runge_kutta=True)
+        graphs = self.__sc.graphs
+        self.assertEqual(list(graphs.keys()), ["EulerMethod", "RungeKuttaMethod", "exact"])
+        self.assertEqual(graphs["EulerMethod"]["y"].shape, (len(y0), self.__n + 1))
+        self.assertEqual(graphs["exact"]["y"].shape, (len(y0), len(graphs["exact"]["x"])))
+        self.assertTrue(np.allclose(graphs["exact"]["y"][:, 0], y0))
+        self.assertRaises(ValueError, self.__midleware.plot_family, self.__sc, self.__x0, [-1, 0, 1], self.__x,
+                          self.__n, title="test")
+
+        # Target function, which accepts only scalars
+        midleware = Midleware(lambda x, y: float(self.__f(x, y)), self.__solution)
+        try:
+            midleware.plot_family(self.__sc, self.__x0, y0, self.__x, self.__n, title="test", show_euler=True,
+                                  show_runge_kutta=True)
+        finally:
+            midleware.shutdown()
+        for name in ["EulerMethod", "RungeKuttaMethod"]:
+            self.assertTrue(np.allclose(self.__sc.graphs[name]["y"], graphs[name]["y"]))
+
+    def test_dashboard(self):
+        calls = []
+        method = EulerMethod(self.__f, self.__solution)
+        compute = method.compute
+        method.compute = lambda *args: calls.append(args) or compute(*args)
+        self.__midleware.register_method("Extra", method)
+        self.__midleware.plot_graphs(self.__sc, self.__x0, self.__y0, self.__x, self.__n, title="test", ylabel="y",
+                                     graph_type=GuiConfigurator.DASHBOARD, methods=["Extra"], slope_field=True)
+        graphs = self.__sc.graphs
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(self.__sc.ylabels, ["y", GuiConfigurator.LTE, GuiConfigurator.GTE])
+        self.assertTrue(self.__sc.slope_field is not None)
+        self.assertEqual([graphs[name]["panel"] for name in ["Extra", "Extra:LTE", "Extra:GTE", "exact"]],
+                         [0, 1, 2, 0])
+
+        for graph_type in [GuiConfigurator.GRAPH, GuiConfigurator.LTE, GuiConfigurator.GTE]:
+            self.__midleware.plot_graphs(self.__sc, self.__x0, self.__y0, self.__x, self.__n, title="test",
+                                         graph_type=graph_type, methods=["Extra"])
+            name = "Extra" if graph_type == GuiConfigurator.GRAPH else "Extra:" + graph_type
+            self.assertTrue(np.array_equal(self.__sc.graphs["Extra"]["y"], graphs[name]["y"]))
+        self.assertRaises(ValueError, self.__midleware.plot_graphs, self.__sc, self.__x0, self.__y0, self.__x,
+                          self.__n, title="test", graph_type=GuiConfigurator.DASHBOARD)
+
+    def test_without_solution(self):
+        midleware = Midleware(self.__f, None)
+        try:
+            midleware.plot_graphs(self.__sc, self.__x0, self.__y0, self.__x, self.__n, title="test",
+                                  graph_type=GuiConfigurator.GRAPH, show_runge_kutta=True)
+            self.assertEqual(list(self.__sc.graphs.keys()), ["RungeKuttaMethod"])
+
+            midleware.plot_graphs(self.__sc, self.__x0, self.__y0, self.__x, self.__n, title="test",
+                                  graph_type=GuiConfigurator.GTE, show_euler=True)
+            expected = self.__plot_all(GuiConfigurator.GTE)["EulerMethod"]["y"]
+            self.assertTrue(np.allclose(self.__sc.graphs["EulerMethod"]["y"], expected, rtol=0.5))
+
+            midleware.plot_gte_dependency(self.__sc, self.__x0, self.__y0, self.__x, self.__n, self.__max_n,
+                                          title="test", show_improved_euler=True)
+            self.assertTrue(np.all(np.isfinite(self.__sc.graphs["ImprovedEulerMethod"]["y"])))
+
+            # Dense output is evaluated at uniform points, gte stays at grid
+            midleware.plot_graphs(self.__sc, self.__x0, self.__y0, self.__x, self.__n, title="test",
+                                  graph_type=GuiConfigurator.DASHBOARD, show_runge_kutta=True, dense_output=True)
+            graphs = self.__sc.graphs
+            self.assertTrue(len(graphs["RungeKuttaMethod"]["x"]) > self.__n + 1)
+            self.assertEqual(len(graphs["RungeKuttaMethod:GTE"]["x"]), self.__n + 1)
+            fine_x, fine_y, _, _ = RungeKuttaMethod(self.__f, None).compute(self.__x0, self.__y0, self.__x, 1000)
+            self.assertTrue(np.allclose(graphs["RungeKuttaMethod"]["y"],
+                                        np.interp(graphs["RungeKuttaMethod"]["x"], fine_x, fine_y), rtol=10 ** -2))
+        finally:
+            midleware.shutdown()
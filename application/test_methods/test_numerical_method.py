@@ -1,4 +1,5 @@
 import logging
+import numpy as np
 from unittest import TestCase
 from application.methods.numerical_method import NumericalMethod
 from application.methods.euler_method import EulerMethod
@@ -40,3 +41,163 @@ class TestNumericalMethod(TestCase):
         test_one_gte_dependency(self.__e_m, "Euler method")
         test_one_gte_dependency(self.__i_e_m, "Improvede Euler method")
         test_one_gte_dependency(self.__rk_m, "Runge-Kuttta method")
+
+    def test_gte_dependency_lockstep(self):
+        for method in [self.__e_m, self.__i_e_m, self.__rk_m]:
+            ns_, gte_d_ = method.get_gte_dependency(self.__x0, self.__y0, self.__x, self.__n, self.__max_n)
+            lockstep_ns, lockstep_gte_d = method.get_gte_dependency_lockstep(self.__x0, self.__y0, self.__x,
+                                                                             self.__n, self.__max_n)
+            self.assertTrue(np.array_equal(lockstep_ns, ns_))
+            self.assertTrue(np.allclose(lockstep_gte_d, gte_d_))
+
+        # N, for which solution exceeds threshold, are NaN as in serial sweep
+        ns_, gte_d_ = self.__e_m.get_gte_dependency(self.__x0, self.__y0, 3, 5, 100, threshold=100)
+        lockstep_ns, lockstep_gte_d = self.__e_m.get_gte_dependency_lockstep(self.__x0, self.__y0, 3, 5, 100,
+                                                                             threshold=100)
+        self.assertTrue(np.array_equal(np.isnan(lockstep_gte_d), np.isnan(gte_d_)))
+        self.assertTrue(np.allclose(lockstep_gte_d, gte_d_, equal_nan=True))
+
+    def test_step_doubling(self):
+        f = lambda x, y: (y ** 2 + x * y - x ** 2) / x ** 2
+        for method, estimated in [(self.__e_m, EulerMethod(f, None)), (self.__i_e_m, ImprovedEulerMethod(f, None)),
+                                  (self.__rk_m, RungeKuttaMethod(f, None))]:
+            x_, y_, lte, gte = [array.copy() for array in method.compute(self.__x0, self.__y0, self.__x, 50)]
+            estimated_x, estimated_y, estimated_lte, estimated_gte = estimated.compute(self.__x0, self.__y0,
+                                                                                       self.__x, 50)
+            self.assertTrue(np.array_equal(estimated_y, y_))
+            # Lte estimate starts at points of approximation, so it is less accurate for low order
+            self.assertTrue(np.allclose(estimated_gte, gte, rtol=0.1, atol=10 ** -9))
+            self.assertTrue(np.allclose(estimated_lte, lte, rtol=0.2, atol=10 ** -9))
+            self.__logger.info(f"{type(method).__name__}: max gte = {method.get_max_abs_gte()}, "
+                               f"estimated = {estimated.get_max_abs_gte()}")
+
+            ns_, gte_d_ = estimated.get_gte_dependency(self.__x0, self.__y0, self.__x, self.__n, self.__max_n)
+            lockstep_ns, lockstep_gte_d = estimated.get_gte_dependency_lockstep(self.__x0, self.__y0, self.__x,
+                                                                                self.__n, self.__max_n)
+            self.assertTrue(np.allclose(lockstep_gte_d, gte_d_))
+
+        # Reference is Richardson extrapolation, it is more accurate than approximation
+        estimated = RungeKuttaMethod(f, None)
+        x_, y_, _, _ = estimated.compute(self.__x0, self.__y0, self.__x, 10)
+        reference_x, reference = estimated.get_reference()
+        _, _, _, gte = self.__rk_m.compute(self.__x0, self.__y0, self.__x, 10)
+        self.assertTrue(np.max(np.absolute(reference - (y_ + gte))) < np.max(np.absolute(gte)) / 10)
+
+        # Initial values near zero are allowed without analytical solution
+        _, _, _, gte = estimated.compute_ensemble(self.__x0, np.array([0.0, 1.0]), self.__x, self.__n)
+        self.assertTrue(np.all(np.isfinite(gte)))
+
+    def test_blow_up(self):
+        # Exact solution has singularity at sqrt(3)
+        for method in [self.__e_m, self.__i_e_m, self.__rk_m]:
+            x_, y_, lte, gte = method.compute(self.__x0, self.__y0, 3, 1000)
+            self.assertTrue(np.all(np.isfinite(y_)))
+            self.assertTrue(method.get_event_x() is not None and method.get_event_x() < 3)
+            self.assertEqual(len(x_), len(gte))
+
+    def test_threshold_event(self):
+        threshold = 10
+        x_, y_, lte, gte = self.__rk_m.compute(self.__x0, self.__y0, 3, 1000, threshold=threshold)
+        self.assertTrue(abs(abs(y_[-1]) - threshold) < 10 ** -6)
+        self.assertTrue(abs(self.__rk_m.get_event_x() - x_[-1]) < 10 ** -12)
+        self.__logger.info(f"Runge-Kutta method: threshold event at x = {self.__rk_m.get_event_x()}")
+
+        x_, y_, lte, gte = self.__rk_m.compute(self.__x0, self.__y0, 3, 1000, event=lambda x, y: x - 1.2)
+        self.assertTrue(abs(x_[-1] - 1.2) < 10 ** -9)
+
+        ns_, gte_d_ = self.__rk_m.get_gte_dependency(self.__x0, self.__y0, 3, self.__n, self.__max_n, threshold)
+        self.assertTrue(np.all(np.isnan(gte_d_)))
+
+        x_, y_, lte, gte = self.__rk_m.compute(self.__x0, self.__y0, self.__x, self.__n, threshold=100)
+        self.assertEqual(len(x_), self.__n + 1)
+        self.assertTrue(self.__rk_m.get_event_x() is None)
+
+    def test_should_stop(self):
+        checks = []
+        should_stop = lambda: checks.append(None) or len(checks) > 3
+        self.assertRaises(ValueError, self.__rk_m.compute, self.__x0, self.__y0, self.__x, 1000,
+                          should_stop=should_stop)
+        self.assertEqual(len(checks), 4)
+
+        x_, y_, lte, gte = self.__rk_m.compute(self.__x0, self.__y0, self.__x, self.__n, should_stop=lambda: False)
+        self.assertEqual(len(x_), self.__n + 1)
+
+    def test_dense_output(self):
+        x_, y_, lte, gte = self.__rk_m.compute(self.__x0, self.__y0, self.__x, self.__n)
+        dense = self.__rk_m.get_dense_output()
+        self.assertTrue(np.allclose(dense(x_), y_))
+
+        exact_x, exact_y = self.__rk_m.solution(self.__x0, self.__y0, self.__x)
+        dense_gte = np.amax(np.absolute(exact_y - dense(exact_x)))
+        self.__logger.info(f"Runge-Kutta method: dense max_gte = {dense_gte}")
+        self.assertTrue(dense_gte < 2 * self.__rk_m.get_max_abs_gte())
+
+        self.assertRaises(ValueError, dense, [self.__x0 - 0.1])
+        self.assertRaises(ValueError, dense, [self.__x + 0.1])
+
+        # Slopes of dense output are stored by compute, only slope at last point needs extra evaluation
+        evaluations = []
+
+        def f(x, y):
+            evaluations.append(np.size(y))
+            return (y ** 2 + x * y - x ** 2) / x ** 2
+
+        method = RungeKuttaMethod(f, lambda x: x * (1 + x ** 2 / 3) / (1 - x ** 2 / 3))
+        method.compute(self.__x0, self.__y0, self.__x, 100)
+        # 4 stages of every step and 4 more for lte from analytical solution
+        self.assertEqual(sum(evaluations), 4 * 100 + 4 * 100 + 1)
+        evaluations.clear()
+        method.get_dense_output()
+        self.assertEqual(sum(evaluations), 0)
+
+    def test_dtype(self):
+        for dtype in [np.float32, np.float64, np.longdouble]:
+            x_, y_, lte, gte = self.__rk_m.compute(self.__x0, self.__y0, self.__x, self.__n, dtype=dtype)
+            self.assertTrue(all(array.dtype == dtype for array in [x_, y_, lte, gte]))
+            self.__logger.info(f"Runge-Kutta method ({np.dtype(dtype).name}): "
+                               f"max_gte = {self.__rk_m.get_max_abs_gte()}")
+
+            ns_, gte_d_ = self.__rk_m.get_gte_dependency(self.__x0, self.__y0, self.__x, self.__n, self.__max_n,
+                                                         dtype=dtype)
+            self.assertEqual(gte_d_.dtype, dtype)
+            self.assertTrue(abs(gte_d_[-1] - self.__rk_m.get_max_abs_gte()) < 10 ** -3)
+
+        # Values beyond range of float64 are not blow-up in longdouble
+        method = EulerMethod(lambda x, y: y, None)
+        x_, y_, lte, gte = method.compute(0, 10 ** 307, 10, 10)
+        self.assertTrue(method.get_event_x() is not None)
+        if np.finfo(np.longdouble).max > np.finfo(np.float64).max:
+            x_, y_, lte, gte = method.compute(0, 10 ** 307, 10, 10, dtype=np.longdouble)
+            self.assertTrue(method.get_event_x() is None)
+            self.assertEqual(y_[-1], np.longdouble(10 ** 307) * 2 ** 10)
+
+    def test_compute_ensemble(self):
+        y0 = np.array([self.__y0, 1.0, -1.0])
+        x_, y_, lte, gte = self.__i_e_m.compute_ensemble(self.__x0, y0, self.__x, self.__n)
+        self.assertEqual(y_.shape, (len(y0), self.__n + 1))
+        for i in range(len(y0)):
+            one_x, one_y, one_lte, one_gte = self.__i_e_m.compute(self.__x0, y0[i], self.__x, self.__n)
+            self.assertTrue(np.array_equal(one_x, x_))
+            self.assertTrue(np.allclose(one_y, y_[i]) and np.allclose(one_gte, gte[i]) and np.allclose(one_lte, lte[i]))
+
+        # Trajectory with singularity is stopped
+        x_, y_, lte, gte = self.__e_m.compute_ensemble(self.__x0, y0, 3, 100, threshold=100)
+        self.assertTrue(np.isnan(y_[0, -1]) and np.all(np.isfinite(y_[0, :10])))
+
+    def test_scalar_target_function(self):
+        # Target function, which accepts only scalars, is evaluated point by point in batched computations
+        f = lambda x, y: float(y ** 2 + x * y - x ** 2) / x ** 2
+        solution = lambda x: x * (1 + x ** 2 / 3) / (1 - x ** 2 / 3)
+        y0 = np.array([self.__y0, 1.0, -1.0])
+        for method, scalar_method in [(self.__rk_m, RungeKuttaMethod(f, solution)),
+                                      (RungeKuttaMethod(lambda x, y: (y ** 2 + x * y - x ** 2) / x ** 2, None),
+                                       RungeKuttaMethod(f, None))]:
+            x_, y_, lte, gte = method.compute_ensemble(self.__x0, y0, self.__x, self.__n)
+            scalar_x, scalar_y, scalar_lte, scalar_gte = scalar_method.compute_ensemble(self.__x0, y0, self.__x,
+                                                                                        self.__n)
+            self.assertTrue(np.allclose(scalar_y, y_) and np.allclose(scalar_lte, lte) and np.allclose(scalar_gte, gte))
+
+            ns_, gte_d_ = method.get_gte_dependency_lockstep(self.__x0, self.__y0, self.__x, self.__n, self.__max_n)
+            scalar_ns, scalar_gte_d = scalar_method.get_gte_dependency_lockstep(self.__x0, self.__y0, self.__x,
+                                                                                self.__n, self.__max_n)
+            self.assertTrue(np.allclose(scalar_gte_d, gte_d_))
@@ -0,0 +1,58 @@
+import os
+import tempfile
+from unittest import TestCase
+from application import report
+from application.parallel import create_thread_executor
+from application.server import create_methods
+
+
+# Some tests
+class TestReport(TestCase):
+    def setUp(self):
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__methods = create_methods(lambda x, y: (y ** 2 + x * y - x ** 2) / x ** 2,
+                                        lambda x: x * (1 + x ** 2 / 3) / (1 - x ** 2 / 3))
+        self.__problem = {"x0": 1, "y0": 2, "x": 1.5, "n": 5, "methods": ["EulerMethod", "RungeKuttaMethod"]}
+
+    def tearDown(self):
+        self.__directory.cleanup()
+
+    def __get_output(self, name: str):
+        return os.path.join(self.__directory.name, name)
+
+    def test_render(self):
+        specs = [
+            {"output": self.__get_output("graph.png"), "type": report.GRAPH, "title": "test", **self.__problem},
+            {"output": self.__get_output("lte.svg"), "type": report.LTE, **self.__problem},
+            {"output": self.__get_output("gte.pdf"), "type": report.GTE, **self.__problem},
+            {"output": self.__get_output("gte_d.png"), "type": report.GTE_DEPENDENCY, "from": 5, "to": 15,
+             **self.__problem}
+        ]
+        outputs = report.render_report(self.__methods, specs, workers=2)
+        self.assertEqual(outputs, [spec["output"] for spec in specs])
+        for output in outputs:
+            self.assertTrue(os.path.getsize(output) > 0)
+        with open(outputs[0], "rb") as file:
+            self.assertEqual(file.read(4), b"\x89PNG")
+
+    def test_shared_solve(self):
+        calls = []
+        compute = self.__methods["EulerMethod"].compute
+        self.__methods["EulerMethod"].compute = lambda *args: calls.append(args) or compute(*args)
+        specs = [
+            {"output": self.__get_output(graph_type + ".png"), "type": graph_type, **self.__problem}
+            for graph_type in (report.GRAPH, report.LTE, report.GTE)
+        ]
+        executor = create_thread_executor()
+        report.render_report(self.__methods, specs, executor=executor)
+        executor.shutdown()
+        self.assertEqual(len(calls), 1)
+
+    def test_bad_spec(self):
+        self.assertRaises(ValueError, report.render_report, self.__methods,
+                          [{"output": self.__get_output("graph.bmp"), "type": report.GRAPH, **self.__problem}])
+        self.assertRaises(ValueError, report.render_report, self.__methods,
+                          [{"output": self.__get_output("graph.png"), "type": "unknown", **self.__problem}])
+        self.assertRaises(ValueError, report.render_report, self.__methods,
+                          [{"output": self.__get_output("gte.png"), "type": report.GTE, **self.__problem,
+                            "methods": ["Unknown"]}])
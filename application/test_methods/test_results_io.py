@@ -0,0 +1,74 @@
+import os
+import tempfile
+import numpy as np
+from matplotlib.figure import Figure
+from unittest import TestCase
+from application import results_io
+from application.methods.runge_kutta_method import RungeKuttaMethod
+from application.replot import FAMILY, FAMILY_LINE_WIDTH, draw_plot, replot
+
+
+# Some tests
+class TestResultsIO(TestCase):
+    def setUp(self):
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__rk_m = RungeKuttaMethod(lambda x, y: (y ** 2 + x * y - x ** 2) / x ** 2,
+                                       lambda x: x * (1 + x ** 2 / 3) / (1 - x ** 2 / 3))
+
+    def tearDown(self):
+        self.__directory.cleanup()
+
+    def test_save_load(self):
+        x_, y_, lte, gte = self.__rk_m.compute(1, 2, 1.5, 5, dtype=np.float32)
+        ensemble_x, ensemble_y, _, _ = self.__rk_m.compute_ensemble(1, np.array([1.0, 2.0]), 1.5, 5)
+        arrays = {"x": x_, "y": y_, "lte": lte, "gte": gte, "ensemble": ensemble_y, "empty": np.empty(0)}
+        meta = {"method": "RungeKuttaMethod", "x0": 1, "y0": 2, "x": 1.5, "n": 5}
+
+        for extension in [results_io.NPZ_EXTENSION, results_io.COLUMNS_EXTENSION]:
+            path = os.path.join(self.__directory.name, "results" + extension)
+            results_io.save(path, arrays, meta)
+            loaded, loaded_meta = results_io.load(path)
+            self.assertEqual(loaded_meta, meta)
+            self.assertEqual(set(loaded.keys()), set(arrays.keys()))
+            for name, array in arrays.items():
+                self.assertEqual(loaded[name].dtype, array.dtype)
+                self.assertTrue(np.array_equal(loaded[name], array))
+            self.assertTrue(isinstance(loaded["ensemble"], np.memmap))
+            del loaded
+
+        self.assertRaises(ValueError, results_io.save, os.path.join(self.__directory.name, "results.txt"), arrays,
+                          meta)
+
+    def test_replot(self):
+        x_, y_, lte, gte = self.__rk_m.compute(1, 2, 1.5, 5)
+        path = os.path.join(self.__directory.name, "plot.cols")
+        results_io.save_plot(path, "plot", "title", "x", "y", {"rk": {"x": x_, "y": y_, "label": "RK", "color": "y"}})
+        kind, title, xlabel, ylabel, graphs = results_io.load_plot(path)
+        self.assertEqual((kind, title, graphs["rk"]["label"]), ("plot", "title", "RK"))
+        self.assertTrue(np.array_equal(graphs["rk"]["y"], y_))
+
+        output = os.path.join(self.__directory.name, "plot.png")
+        replot(path, output)
+        self.assertTrue(os.path.getsize(output) > 0)
+
+    def test_replot_dashboard(self):
+        x_, y_, lte, gte = self.__rk_m.compute(1, 2, 1.5, 5)
+        path = os.path.join(self.__directory.name, "dashboard.npz")
+        results_io.save_plot(path, "dashboard", "title", "x", ["y", "LTE", "GTE"], {
+            "rk": {"x": x_, "y": y_, "label": "RK", "color": "y", "panel": 0},
+            "rk:LTE": {"x": x_, "y": lte, "label": "RK", "color": "y", "panel": 1},
+            "rk:GTE": {"x": x_, "y": gte, "label": "RK", "color": "y", "panel": 2}
+        })
+        kind, title, xlabel, ylabel, graphs = results_io.load_plot(path)
+        self.assertEqual((kind, ylabel, graphs["rk:GTE"]["panel"]), ("dashboard", ["y", "LTE", "GTE"], 2))
+
+        output = os.path.join(self.__directory.name, "dashboard.png")
+        replot(path, output)
+        self.assertTrue(os.path.getsize(output) > 0)
+
+    def test_draw_family(self):
+        figure = Figure()
+        ax = figure.add_subplot()
+        draw_plot(ax, FAMILY, "title", "x", "y", {"rk": {"x": np.arange(3), "y": np.ones((2, 3)), "label": "RK"}})
+        self.assertEqual(len(ax.collections[0].get_segments()), 2)
+        self.assertEqual(ax.collections[0].get_linewidths()[0], FAMILY_LINE_WIDTH)
@@ -0,0 +1,133 @@
+import json
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+from application.server import ComputeServer, create_methods, decode_array
+
+
+# Some tests
+class TestComputeServer(TestCase):
+    def setUp(self):
+        self.__f = lambda x, y: (y ** 2 + x * y - x ** 2) / x ** 2
+        self.__solution = lambda x: x * (1 + x ** 2 / 3) / (1 - x ** 2 / 3)
+        self.__methods = create_methods(self.__f, self.__solution)
+        self.__server = ComputeServer(self.__methods, batch_window=0.05)
+        self.__thread = threading.Thread(target=self.__server.serve_forever)
+        self.__thread.start()
+        self.__url = f"http://127.0.0.1:{self.__server.server_address[1]}"
+
+    def tearDown(self):
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+
+    def __post(self, path: str, **request):
+        with urlopen(Request(self.__url + path, json.dumps(request).encode("utf-8"), method="POST")) as response:
+            return json.loads(response.read())
+
+    def test_compute(self):
+        response = self.__post("/compute", method="RungeKuttaMethod", x0=1, y0=2, x=1.5, n=5, encoding="base64")
+        x_, y_, lte, gte = self.__methods["RungeKuttaMethod"].compute(1, 2, 1.5, 5)
+        self.assertTrue(np.array_equal(decode_array(response["y"]), y_))
+        self.assertTrue(np.array_equal(decode_array(response["gte"]), gte))
+
+    def test_batching(self):
+        y0 = np.linspace(1, 2, 16)
+        with ThreadPoolExecutor(len(y0)) as executor:
+            responses = list(executor.map(
+                lambda y0_: self.__post("/compute", method="EulerMethod", x0=1, y0=y0_, x=1.5, n=10), y0
+            ))
+
+        for y0_, response in zip(y0, responses):
+            x_, y_, lte, gte = self.__methods["EulerMethod"].compute(1, y0_, 1.5, 10)
+            self.assertTrue(np.allclose(response["y"], y_))
+
+        with urlopen(self.__url + "/metrics") as response:
+            metrics = json.loads(response.read())
+        self.assertEqual(metrics["requests"], len(y0))
+        self.assertTrue(metrics["batches"] < len(y0))
+        self.assertTrue(metrics["latency_ms"]["p50"] <= metrics["latency_ms"]["p99"])
+
+    def test_batching_threshold(self):
+        # Result must not depend on requests, which arrive in the same window
+        y0 = [2.0, 1.5]
+        with ThreadPoolExecutor(len(y0)) as executor:
+            responses = list(executor.map(
+                lambda y0_: self.__post("/compute", method="EulerMethod", x0=1, y0=y0_, x=3, n=100, threshold=10),
+                y0
+            ))
+
+        for y0_, response in zip(y0, responses):
+            x_, y_, lte, gte = self.__methods["EulerMethod"].compute(1, y0_, 3, 100, 10)
+            self.assertEqual(len(response["y"]), len(y_))
+            self.assertTrue(np.allclose(response["y"], y_) and np.allclose(response["gte"], gte))
+        self.assertAlmostEqual(responses[0]["y"][-1], 10)
+
+    def test_strict_json(self):
+        request = Request(self.__url + "/gte_dependency", json.dumps({
+            "method": "EulerMethod", "x0": 1, "y0": 2, "x": 3, "from": 5, "to": 15, "threshold": 100
+        }).encode("utf-8"), method="POST")
+        with urlopen(request) as response:
+            # NaN is not valid JSON
+            body = json.loads(response.read(), parse_constant=lambda constant: self.fail(constant))
+        self.assertTrue(None in body["gte_d"])
+        self.assertTrue(np.isnan(decode_array(body["gte_d"])).any())
+
+    def test_sweeps(self):
+        response = self.__post("/gte_dependency", method="ImprovedEulerMethod", x0=1, y0=2, x=1.5,
+                               **{"from": 5, "to": 15})
+        self.assertEqual(len(response["gte_d"]), 11)
+        lockstep = self.__post("/gte_dependency", method="ImprovedEulerMethod", x0=1, y0=2, x=1.5, lockstep=True,
+                               **{"from": 5, "to": 15})
+        self.assertTrue(np.allclose(lockstep["gte_d"], response["gte_d"]))
+
+        response = self.__post("/tolerance", method="RungeKuttaMethod", x0=1, y0=2, x=1.5, tolerance=10 ** -4,
+                               max_n=1000)
+        self.assertTrue(response["max_gte"] <= 10 ** -4)
+        self.__methods["RungeKuttaMethod"].compute(1, 2, 1.5, response["n"] - 1)
+        self.assertTrue(self.__methods["RungeKuttaMethod"].get_max_abs_gte() > 10 ** -4)
+
+        response = self.__post("/ensemble", method="RungeKuttaMethod", x0=1, y0=[1, 2, 3], x=1.5, n=5)
+        self.assertEqual(np.array(response["y"]).shape, (3, 6))
+
+    def test_errors(self):
+        with self.assertRaises(HTTPError) as context:
+            self.__post("/compute", method="RungeKuttaMethod", x0=1, y0=0, x=1.5, n=5)
+        self.assertEqual(context.exception.code, 400)
+        self.assertEqual(json.loads(context.exception.read())["fields"], ["x0", "y0"])
+
+        # Intervals, which GUI rejects
+        for x0, x in [(2, 1), (-1, 1), (1, 1.05)]:
+            for path in ["/compute", "/gte_dependency", "/tolerance", "/ensemble"]:
+                with self.assertRaises(HTTPError) as context:
+                    self.__post(path, method="EulerMethod", x0=x0, y0=2, x=x, n=5, tolerance=1, max_n=10,
+                                **{"from": 5, "to": 15})
+                self.assertEqual(context.exception.code, 400)
+                self.assertEqual(json.loads(context.exception.read())["fields"], ["x0", "x"])
+
+        with self.assertRaises(HTTPError) as context:
+            self.__post("/unknown")
+        self.assertEqual(context.exception.code, 404)
+
+        # Unexpected error is reported as JSON
+        gte_dependency = self.__methods["EulerMethod"].get_gte_dependency
+        self.__methods["EulerMethod"].get_gte_dependency = lambda *args: 1 / 0
+        with self.assertRaises(HTTPError) as context:
+            self.__post("/gte_dependency", method="EulerMethod", x0=1, y0=2, x=1.5, **{"from": 5, "to": 15})
+        self.assertEqual(context.exception.code, 500)
+        self.assertTrue("ZeroDivisionError" in json.loads(context.exception.read())["error"])
+        self.__methods["EulerMethod"].get_gte_dependency = gte_dependency
+
+    def test_longdouble(self):
+        x_, y_, lte, gte = self.__methods["RungeKuttaMethod"].compute(1, 2, 1.5, 5, dtype=np.longdouble)
+        response = self.__post("/compute", method="RungeKuttaMethod", x0=1, y0=2, x=1.5, n=5, dtype="longdouble")
+        self.assertTrue(np.allclose(response["y"], y_.astype(np.float64)))
+        response = self.__post("/gte_dependency", method="RungeKuttaMethod", x0=1, y0=2, x=1.5, dtype="longdouble",
+                               **{"from": 5, "to": 15})
+        self.assertEqual(len(response["gte_d"]), 11)
+        response = self.__post("/compute", method="RungeKuttaMethod", x0=1, y0=2, x=1.5, n=5, dtype="longdouble",
+                               encoding="base64")
+        self.assertTrue(np.array_equal(decode_array(response["y"]), y_))
@@ -0,0 +1,39 @@
+import math
+import numpy as np
+from unittest import TestCase
+from application.slope_field import SlopeField
+
+
+# Some tests
+class TestSlopeField(TestCase):
+    def setUp(self):
+        self.__calls = 0
+
+        def f(x, y):
+            self.__calls += 1
+            return (3 * y + 2 * x * y) / x ** 2
+
+        self.__field = SlopeField(f, density=20, tile_size=4)
+
+    def test_evaluate(self):
+        x, y, u, v = self.__field.evaluate((1, 2), (-1, 1))
+        self.assertTrue(np.all((1 <= x) & (x <= 2) & (-1 <= y) & (y <= 1)))
+        self.assertTrue(np.allclose(v / u, (3 * y + 2 * x * y) / x ** 2))
+        self.assertTrue(np.allclose(u ** 2 + v ** 2, 1))
+
+    def test_cache(self):
+        self.__field.evaluate((1, 2), (-1, 1))
+        self.assertEqual(self.__calls, 1)
+        self.__field.evaluate((1, 2), (-1, 1))
+        self.assertEqual(self.__calls, 1)
+
+        # Only exposed tiles are computed, with one call
+        tiles = len(self.__field._tiles)
+        self.__field.evaluate((1.5, 2.5), (-1, 1))
+        self.assertEqual(self.__calls, 2)
+        self.assertTrue(tiles < len(self.__field._tiles) < 2 * tiles)
+
+    def test_scalar_function(self):
+        field = SlopeField(lambda x, y: math.sin(x) * y)
+        x, y, u, v = field.evaluate((0, 1), (0, 1))
+        self.assertTrue(np.allclose(v / u, np.sin(x) * y))
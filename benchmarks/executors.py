@@ -0,0 +1,51 @@
+import sys
+import pathlib
+
+sys.path.append(str(pathlib.Path(__file__).parent.parent.resolve()))
+import argparse
+import multiprocessing
+import time
+from application import problem
+from application.middleware import Midleware
+
+
+class _NullCanvas:
+    """
+    Canvas, which ignores plotted graphs
+    """
+
+    def plot(self, *args, **kwargs):
+        pass
+
+
+def run(from_: int, to_: int, repeat: int):
+    """
+    Print best time of GTE(N) of all three methods with thread pool and process pool
+
+    :return:
+    """
+    print(f"N = {from_}..{to_}, CPUs = {multiprocessing.cpu_count()}")
+    for executor in ("threads", "processes"):
+        midleware = Midleware(problem.f, problem.solution)
+        if executor == "processes":
+            midleware.use_process_pool()
+        best = float("inf")
+        try:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                midleware.plot_gte_dependency(_NullCanvas(), 1.0, 1.0, 6.0, from_, to_, title="", show_euler=True,
+                                              show_improved_euler=True, show_runge_kutta=True)
+                best = min(best, time.perf_counter() - start)
+        finally:
+            midleware.shutdown()
+        print(f"{executor:<12}{best:>10.3f} s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark of solving methods simultaneously: threads, processes")
+    parser.add_argument("--from", dest="from_", type=int, default=10)
+    parser.add_argument("--to", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run(args.from_, args.to, args.repeat)
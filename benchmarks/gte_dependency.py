@@ -0,0 +1,83 @@
+import sys
+import pathlib
+
+sys.path.append(str(pathlib.Path(__file__).parent.parent.resolve()))
+import argparse
+import multiprocessing
+import time
+import numpy as np
+from application import problem
+from application.parallel import create_process_executor, submit_method
+from application.server import create_methods
+
+
+def serial(method, x0: float, y0: float, x: float, from_: int, to_: int, workers: int):
+    """
+    One compute per N in current process
+    """
+    return method.get_gte_dependency(x0, y0, x, from_, to_)[1].copy()
+
+
+def process_pool(method, x0: float, y0: float, x: float, from_: int, to_: int, workers: int):
+    """
+    Interval of N is split between worker processes, chunks of large N are smaller, so work is balanced
+    """
+    name = type(method).__name__
+    # Cost of N is proportional to N, so bounds split sum of N evenly
+    bounds = np.sqrt(np.linspace(from_ ** 2, (to_ + 1) ** 2, 4 * workers + 1)).astype(int)
+    bounds = np.unique(np.clip(bounds, from_, to_ + 1))
+    executor = create_process_executor({name: method}, workers)
+    try:
+        futures = [
+            submit_method(executor, name, method, "get_gte_dependency", x0, y0, x, int(start), int(end) - 1)
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+        return np.concatenate([future.result()[1] for future in futures])
+    finally:
+        executor.shutdown()
+
+
+def lockstep(method, x0: float, y0: float, x: float, from_: int, to_: int, workers: int):
+    """
+    All N are computed simultaneously
+    """
+    return method.get_gte_dependency_lockstep(x0, y0, x, from_, to_)[1].copy()
+
+
+def run(methods: dict, x0: float, y0: float, x: float, from_: int, to_: int, workers: int, repeat: int):
+    """
+    Print best time of every sweep mode for every method
+
+    :return:
+    """
+    print(f"N = {from_}..{to_}, workers = {workers}")
+    print(f"{'method':<22}{'serial, s':>12}{'pool, s':>12}{'lockstep, s':>14}{'max rel diff':>16}")
+    for name, method in methods.items():
+        times = []
+        results = []
+        for mode in (serial, process_pool, lockstep):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = mode(method, x0, y0, x, from_, to_, workers)
+                best = min(best, time.perf_counter() - start)
+            times.append(best)
+            results.append(result)
+        with np.errstate(all="ignore"):
+            diff = np.nanmax(np.absolute(results[2] - results[0]) / np.absolute(results[0]))
+        print(f"{name:<22}{times[0]:>12.3f}{times[1]:>12.3f}{times[2]:>14.3f}{diff:>16.2e}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark of GTE(N) sweep: serial, process pool, lockstep")
+    parser.add_argument("--x0", type=float, default=1.0)
+    parser.add_argument("--y0", type=float, default=1.0)
+    parser.add_argument("--x", type=float, default=6.0)
+    parser.add_argument("--from", dest="from_", type=int, default=10)
+    parser.add_argument("--to", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    run(create_methods(problem.f, problem.solution), args.x0, args.y0, args.x, args.from_, args.to, args.workers,
+        args.repeat)
@@ -1,6 +1,31 @@
-from application.application import Application
+import argparse
 
 
 # Entry point
 if __name__ == '__main__':
-    Application.run()
+    parser = argparse.ArgumentParser(description="Numerical methods")
+    parser.add_argument("--serve", action="store_true", help="run local JSON-over-HTTP server instead of GUI")
+    parser.add_argument("--host", default="127.0.0.1", help="host of server")
+    parser.add_argument("--port", type=int, default=8000, help="port of server")
+    parser.add_argument("--replot", metavar="PATH", help="plot saved results (.npz or .cols) without GUI")
+    parser.add_argument("--output", metavar="PATH", help="save replotted results to image instead of showing")
+    parser.add_argument("--report", metavar="PATH", help="render figures from JSON list of figure specs without GUI")
+    parser.add_argument("--workers", type=int, help="number of processes for rendering of report")
+    args = parser.parse_args()
+
+    if args.replot:
+        from application.replot import replot
+        replot(args.replot, args.output)
+    elif args.report:
+        from application import problem
+        from application.report import render_report_file
+        from application.server import create_methods
+        for path in render_report_file(create_methods(problem.f, problem.solution), args.report, args.workers):
+            print(path)
+    elif args.serve:
+        from application import problem
+        from application.server import serve
+        serve(problem.f, problem.solution, args.host, args.port)
+    else:
+        from application.application import Application
+        Application.run()